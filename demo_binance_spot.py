@@ -9,7 +9,8 @@ from typing import List, Dict
 from src.core.events.EventBus import EventBus
 from src.core.events.EventType import PriceUpdateEvent, EventType
 from src.strategy.engines.StrategyEngine import StrategyEngine
-from src.core.orders.OrderState import OrderManager, OrderState, OrderStatus
+from src.core.orders.OrderManager import OrderManager
+from src.core.orders.OrderState import OrderState, OrderStatus
 from src.risk.management.RiskManager import RiskManager
 from src.risk.management.RiskConfig import RiskConfig
 from src.config.Configs import StrategyConfig
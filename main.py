@@ -10,8 +10,7 @@ import os
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from strategy_main import main
-import asyncio
+from strategy_main import run
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    run() 
\ No newline at end of file
@@ -38,11 +38,12 @@ class ExecutionConfig:
     symbol: str
     worker_count: int
     batch_size: int
-    rate_limit: int  # 每秒请求数
+    rate_limit: float  # 每秒请求数（可为小数，如2.5）
     max_retries: int
     retry_delay: float
     modify_worker_count: int  # 改单工作器数量
-    modify_rate_limit: int  # 改单速率限制
+    modify_rate_limit: float  # 改单速率限制（每秒，可为小数）
+    request_timeout: float = 10.0  # 交易所请求超时（秒）
     
 @dataclass
 class RiskConfig:
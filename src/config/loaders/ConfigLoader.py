@@ -49,7 +49,8 @@ class ConfigLoader:
             worker_count=config_data['execution']['worker_count'],
             rate_limit=config_data['execution']['rate_limit'],
             max_retries=config_data['execution']['max_retries'],
-            retry_delay=config_data['execution']['retry_delay']
+            retry_delay=config_data['execution']['retry_delay'],
+            request_timeout=config_data['execution'].get('request_timeout', 10.0)
         )
         
         # 解析风险配置
@@ -3,15 +3,20 @@ import logging
 from typing import Dict, List, Callable, Any
 from collections import defaultdict
 import uuid
-from .EventType import EventType, BaseEvent
+from .EventType import EventType, BaseEvent, new_correlation_id
 import time
 
 class EventBusStats:
     """事件总线统计"""
     def __init__(self):
+        self.reset()
+        
+    def reset(self) -> None:
+        """清零统计（原地重置，工作器持有的引用保持有效）"""
         self.events_published = 0
         self.events_processed = 0
         self.events_failed = 0
+        self.events_dropped = 0
         self.total_processing_time = 0.0
         self.avg_processing_time = 0.0
         self.max_processing_time = 0.0
@@ -23,9 +28,10 @@ class EventBusStats:
         self.max_processing_time = max(self.max_processing_time, processing_time)
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, max_queue_size: int = 0):
         self.subscribers: Dict[EventType, List[Callable]] = defaultdict(list)
-        self.event_queue = asyncio.Queue()
+        # max_queue_size为0时队列无界
+        self.event_queue = asyncio.Queue(maxsize=max_queue_size)
         self.processing_tasks = []
         self.stats = EventBusStats()
         self.logger = logging.getLogger(__name__)
@@ -44,11 +50,12 @@ class EventBus:
         await asyncio.gather(*self.processing_tasks, return_exceptions=True)
         
     async def subscribe(self, event_type: EventType, callback: Callable) -> str:
-        """订阅事件"""
+        """订阅事件（回调可为协程函数或同步函数，同步回调在事件循环中直接执行，不得阻塞）"""
         subscription_id = str(uuid.uuid4())
         self.subscribers[event_type].append({
             'id': subscription_id,
-            'callback': callback
+            'callback': callback,
+            'is_async': asyncio.iscoroutinefunction(callback)
         })
         return subscription_id
         
@@ -59,34 +66,68 @@ class EventBus:
             if sub['id'] != subscription_id
         ]
         
+    def clear_subscribers(self) -> None:
+        """移除所有订阅"""
+        self.subscribers.clear()
+        
     async def publish(self, event: BaseEvent) -> None:
         """发布事件"""
-        event.correlation_id = event.correlation_id or str(uuid.uuid4())
+        # BaseEvent本身没有correlation_id字段，由总线补充
+        if getattr(event, 'correlation_id', None) is None:
+            event.correlation_id = new_correlation_id()
         await self.event_queue.put(event)
         self.stats.events_published += 1
         
+    async def publish_many(self, events: List[BaseEvent]) -> None:
+        """批量发布事件，队列未满时整批入队不挂起"""
+        queue = self.event_queue
+        for event in events:
+            if getattr(event, 'correlation_id', None) is None:
+                event.correlation_id = new_correlation_id()
+            if queue.full():
+                await queue.put(event)
+            else:
+                queue.put_nowait(event)
+        self.stats.events_published += len(events)
+        
+    def publish_nowait(self, event: BaseEvent) -> bool:
+        """非阻塞发布事件，队列已满时丢弃并返回False"""
+        if getattr(event, 'correlation_id', None) is None:
+            event.correlation_id = new_correlation_id()
+        try:
+            self.event_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stats.events_dropped += 1
+            return False
+        self.stats.events_published += 1
+        return True
+        
     async def _event_processor(self, processor_name: str) -> None:
         """事件处理器"""
+        # 循环内使用的属性预先绑定为局部变量
+        queue_get = self.event_queue.get
+        task_done = self.event_queue.task_done
+        get_subscribers = self.subscribers.get
+        handle_event = self._handle_event
+        gather = asyncio.gather
+        stats = self.stats
         while True:
             try:
-                event = await self.event_queue.get()
+                event = await queue_get()
                 
                 # 获取订阅者
-                subscribers = self.subscribers.get(event.event_type, [])
+                subscribers = get_subscribers(event.event_type)
                 
-                # 并行处理所有订阅者
+                # 单个订阅者直接在工作器内调用，不创建任务；
+                # 多个订阅者并发执行，慢订阅者不阻塞同一事件的其他订阅者
                 if subscribers:
-                    tasks = []
-                    for subscriber in subscribers:
-                        task = asyncio.create_task(
-                            self._handle_event(subscriber['callback'], event)
-                        )
-                        tasks.append(task)
-                        
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                    if len(subscribers) == 1:
+                        await handle_event(subscribers[0], event)
+                    else:
+                        await gather(*[handle_event(subscriber, event) for subscriber in subscribers])
                     
-                self.event_queue.task_done()
-                self.stats.events_processed += 1
+                task_done()
+                stats.events_processed += 1
                 
             except asyncio.CancelledError:
                 break
@@ -94,15 +135,16 @@ class EventBus:
                 self.logger.error(f"Event processor {processor_name} error: {e}")
                 await asyncio.sleep(0.1)
                 
-    async def _handle_event(self, callback: Callable, event: BaseEvent) -> None:
+    async def _handle_event(self, subscriber: Dict[str, Any], event: BaseEvent) -> None:
         """处理单个事件"""
         try:
             start_time = time.time()
             
-            if asyncio.iscoroutinefunction(callback):
-                await callback(event)
+            # 回调类型在订阅时已确定
+            if subscriber['is_async']:
+                await subscriber['callback'](event)
             else:
-                callback(event)
+                subscriber['callback'](event)
                 
             processing_time = time.time() - start_time
             self.stats.add_processing_time(processing_time)
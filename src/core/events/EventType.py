@@ -2,7 +2,8 @@ from enum import Enum, auto
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from decimal import Decimal
-import uuid
+import itertools
+import os
 
 class EventType(Enum):
     # 市场数据事件
@@ -37,6 +38,14 @@ class EventType(Enum):
     SYSTEM_STOP = auto()
     HEARTBEAT = auto()
 
+# 关联ID只需进程内唯一，使用计数器代替uuid4以避免每个事件读取系统随机源
+_pid = os.getpid()
+_corr_counter = itertools.count()
+
+def new_correlation_id() -> str:
+    """生成进程内唯一的关联ID"""
+    return f"{_pid}-{next(_corr_counter)}"
+
 @dataclass
 class BaseEvent:
     """基础事件类"""
@@ -53,7 +62,7 @@ class PriceUpdateEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class OrderStatusEvent(BaseEvent):
@@ -65,7 +74,7 @@ class OrderStatusEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class OrderResetEvent(BaseEvent):
@@ -73,7 +82,7 @@ class OrderResetEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class OrderModifyEvent(BaseEvent):
@@ -81,7 +90,7 @@ class OrderModifyEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class OrderModifySuccessEvent(BaseEvent):
@@ -89,7 +98,7 @@ class OrderModifySuccessEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class OrderModifyFailureEvent(BaseEvent):
@@ -97,7 +106,7 @@ class OrderModifyFailureEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class PlaceOrderEvent(BaseEvent):
@@ -109,7 +118,7 @@ class PlaceOrderEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
 
 @dataclass
 class CancelOrderEvent(BaseEvent):
@@ -119,4 +128,4 @@ class CancelOrderEvent(BaseEvent):
     correlation_id: Optional[str] = None
     def __post_init__(self):
         if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
+            self.correlation_id = new_correlation_id()
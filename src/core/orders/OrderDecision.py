@@ -1,13 +1,12 @@
-from ..events.EventType import BaseEvent, EventType
+from ..events.EventType import BaseEvent, EventType, new_correlation_id
 from decimal import Decimal
 from typing import Optional
-import uuid
 
 class OrderDecision(BaseEvent):
     """订单决策基类"""
     def __init__(self, event_type: EventType, timestamp=None, data=None):
         super().__init__(event_type=event_type, timestamp=timestamp, data=data or {})
-        self.correlation_id = str(uuid.uuid4())
+        self.correlation_id = new_correlation_id()
 
 class PlaceOrderDecision(OrderDecision):
     def __init__(self, side: str, price: Decimal, quantity: Decimal, priority: int = 5):
@@ -1,66 +1,24 @@
-from enum import Enum
-from dataclasses import dataclass
 from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right, insort
 import asyncio
 import time
-from decimal import Decimal
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
 import logging
-
-class OrderStatus(Enum):
-    PENDING_NEW = "PENDING_NEW"
-    ACTIVE = "ACTIVE"
-    PARTIALLY_FILLED = "PARTIALLY_FILLED"
-    FILLED = "FILLED"
-    PENDING_CANCEL = "PENDING_CANCEL"
-    CANCELLED = "CANCELLED"
-    REJECTED = "REJECTED"
-    EXPIRED = "EXPIRED"
-    PENDING_MODIFY = "PENDING_MODIFY"
-
-@dataclass
-class OrderState:
-    """订单状态对象"""
-    order_id: str
-    client_order_id: str
-    symbol: str
-    side: str
-    price: Decimal
-    original_quantity: Decimal
-    executed_quantity: Decimal
-    status: OrderStatus
-    create_time: float
-    update_time: float
-    last_event_time: float
-    
-    @property
-    def remaining_quantity(self) -> Decimal:
-        return self.original_quantity - self.executed_quantity
-        
-    @property
-    def is_active(self) -> bool:
-        return self.status in [OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED]
-        
-    @property
-    def order_value(self) -> Decimal:
-        return self.price * self.original_quantity
-
-@dataclass
-class ModifyOrderRequest:
-    """改单请求"""
-    order_id: str
-    new_price: Optional[Decimal] = None
-    new_quantity: Optional[Decimal] = None
-    timestamp: float = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = time.time()
+from .OrderState import OrderStatus, OrderState, ModifyOrderRequest
+from ...utils.pricing.PriceTicks import to_ticks, to_ticks_exact
 
 class OrderManager:
     def __init__(self, event_bus, reset_interval: int = 300):  # 默认5分钟重置
         self.orders: Dict[str, OrderState] = {}
         self.client_order_mapping: Dict[str, str] = {}
         self.event_bus = event_bus
+        
+        # 价格索引：有序整数tick价格列表 + 价格到订单ID的映射，用于价格区间查询
+        self._price_levels: List[int] = []
+        self._orders_at_price: Dict[int, Dict[str, None]] = {}
+        self._indexed_price: Dict[str, int] = {}
+        # 锁串行化“读取-修改-发布”的异步流程；submit_order不获取锁、同步写入订单表和价格索引，
+        # 因此持锁的协程不得跨await迭代self.orders或价格索引（需先复制为列表再等待）
         self._lock = asyncio.Lock()
         self.logger = logging.getLogger(__name__)
         
@@ -73,6 +31,9 @@ class OrderManager:
         self.pending_modifications: Dict[str, ModifyOrderRequest] = {}
         self.modification_lock = asyncio.Lock()
         
+        # 已归档订单的延迟清理任务，停止时取消
+        self._cleanup_tasks = set()
+        
         # 启动定时重置任务
         self.reset_task = asyncio.create_task(self._periodic_reset())
         
@@ -88,6 +49,10 @@ class OrderManager:
                 await self.reset_task
             except asyncio.CancelledError:
                 pass
+        cleanup_tasks = list(self._cleanup_tasks)
+        for task in cleanup_tasks:
+            task.cancel()
+        await asyncio.gather(*cleanup_tasks, return_exceptions=True)
         self.logger.info("订单管理器已停止")
         
     async def _periodic_reset(self):
@@ -134,35 +99,85 @@ class OrderManager:
             self.last_reset_time = current_time
             self.logger.info(f"定时重置完成，标记了 {len(active_orders)} 个订单为待撤销状态")
             
+    def submit_order(self, order: OrderState) -> None:
+        """同步写入新订单（不获取锁、不挂起），并以非阻塞方式发布订单状态事件"""
+        self._apply_add(order)
+        if not self.event_bus.publish_nowait(self._order_added_event(order)):
+            self.logger.warning(f"事件队列已满，新订单状态事件被丢弃: {order.client_order_id}")
+        
+    def bind_order_id(self, client_order_id: str, order_id: str) -> None:
+        """交易所返回订单ID后，将订单从客户端订单ID键迁移到交易所订单ID"""
+        order = self.orders.pop(client_order_id, None)
+        if order is None:
+            return
+        order.order_id = order_id
+        self.orders[order_id] = order
+        self.client_order_mapping[client_order_id] = order_id
+        price = self._indexed_price.get(client_order_id)
+        if price is not None:
+            self._unindex_order(client_order_id)
+            self._index_order(order_id, price)
+        
+    def _index_order(self, order_id: str, price: int) -> None:
+        """将订单按整数tick价格加入价格索引（已在索引中时按新价格重新索引）"""
+        self._unindex_order(order_id)
+        order_ids = self._orders_at_price.get(price)
+        if order_ids is None:
+            insort(self._price_levels, price)
+            order_ids = self._orders_at_price[price] = {}
+        order_ids[order_id] = None
+        self._indexed_price[order_id] = price
+        
+    def _unindex_order(self, order_id: str) -> None:
+        """将订单移出价格索引"""
+        price = self._indexed_price.pop(order_id, None)
+        if price is None:
+            return
+        order_ids = self._orders_at_price[price]
+        del order_ids[order_id]
+        if not order_ids:
+            del self._orders_at_price[price]
+            del self._price_levels[bisect_left(self._price_levels, price)]
+            
     async def add_order(self, order: OrderState) -> None:
         """添加新订单"""
         async with self._lock:
-            self.orders[order.order_id] = order
-            self.client_order_mapping[order.client_order_id] = order.order_id
-            
-            # 发布订单状态事件
-            from ..events.EventType import OrderStatusEvent, EventType
-            await self.event_bus.publish(OrderStatusEvent(
-                event_type=EventType.ORDER_STATUS,
-                timestamp=time.time(),
-                data={},
-                order_id=order.order_id,
-                status=str(order.status),
-                order_data={
-                    'order_id': order.order_id,
-                    'client_order_id': order.client_order_id,
-                    'symbol': order.symbol,
-                    'side': order.side,
-                    'price': str(order.price),
-                    'original_quantity': str(order.original_quantity),
-                    'executed_quantity': str(order.executed_quantity),
-                    'status': str(order.status),
-                    'create_time': order.create_time,
-                    'update_time': order.update_time,
-                    'last_event_time': order.last_event_time
-                }
-            ))
+            self._apply_add(order)
+            await self.event_bus.publish(self._order_added_event(order))
             
+    def _apply_add(self, order: OrderState) -> None:
+        """将订单写入订单表和价格索引，价格精度细于1 tick时抛出ValueError且不写入"""
+        price_ticks = order.price_ticks
+        # 交易所订单ID返回前以客户端订单ID为键
+        order_id = order.order_id or order.client_order_id
+        self.orders[order_id] = order
+        self.client_order_mapping[order.client_order_id] = order_id
+        self._index_order(order_id, price_ticks)
+        
+    def _order_added_event(self, order: OrderState):
+        """构造新订单的状态事件"""
+        from ..events.EventType import OrderStatusEvent, EventType
+        return OrderStatusEvent(
+            event_type=EventType.ORDER_STATUS,
+            timestamp=time.time(),
+            data={},
+            order_id=order.order_id or order.client_order_id,
+            status=str(order.status),
+            order_data={
+                'order_id': order.order_id,
+                'client_order_id': order.client_order_id,
+                'symbol': order.symbol,
+                'side': order.side,
+                'price': str(order.price),
+                'original_quantity': str(order.original_quantity),
+                'executed_quantity': str(order.executed_quantity),
+                'status': str(order.status),
+                'create_time': order.create_time,
+                'update_time': order.update_time,
+                'last_event_time': order.last_event_time
+            }
+        )
+        
     async def update_order_status(self, order_id: str, new_status: OrderStatus,
                                 executed_qty: Decimal = None) -> None:
         """更新订单状态"""
@@ -223,6 +238,14 @@ class OrderManager:
                 self.logger.warning(f"订单状态不允许改单: {order_id}, 状态: {order.status}")
                 return False
                 
+            # 价格精度细于1 tick时拒绝改单
+            if new_price is not None:
+                try:
+                    to_ticks_exact(new_price)
+                except ValueError:
+                    self.logger.warning(f"改单价格精度超过最小价格单位: {order_id}, 价格: {new_price}")
+                    return False
+                    
             # 检查是否有实际变化
             has_changes = False
             if new_price is not None and new_price != order.price:
@@ -281,9 +304,10 @@ class OrderManager:
                 modify_request = self.pending_modifications.get(order_id)
                 if modify_request:
                     if modify_request.new_price is not None:
-                        order.price = modify_request.new_price
+                        order.set_price(modify_request.new_price)
+                        self._index_order(order_id, order.price_ticks)
                     if modify_request.new_quantity is not None:
-                        order.original_quantity = modify_request.new_quantity
+                        order.set_quantity(modify_request.new_quantity)
                         
                     order.status = OrderStatus.ACTIVE
                     order.update_time = time.time()
@@ -344,17 +368,30 @@ class OrderManager:
             
     async def get_orders_by_price_range(self, min_price: Decimal, 
                                       max_price: Decimal) -> List[OrderState]:
-        """根据价格范围获取订单"""
+        """根据价格范围获取订单（二分查找价格索引，只访问区间内的订单）"""
+        # 订单价格为整数tick，区间边界向内取整后比较
+        min_ticks = to_ticks(min_price, ROUND_CEILING)
+        max_ticks = to_ticks(max_price, ROUND_FLOOR)
         async with self._lock:
-            return [
-                order for order in self.orders.values()
-                if order.is_active and min_price <= order.price <= max_price
-            ]
+            levels = self._price_levels
+            orders_at_price = self._orders_at_price
+            orders = self.orders
+            result = []
+            for price in levels[bisect_left(levels, min_ticks):bisect_right(levels, max_ticks)]:
+                for order_id in orders_at_price[price]:
+                    order = orders[order_id]
+                    if order.is_active:
+                        result.append(order)
+            return result
             
     async def get_order_by_id(self, order_id: str) -> Optional[OrderState]:
         """根据订单ID获取订单"""
         async with self._lock:
             return self.orders.get(order_id)
+
+    def get_order_by_id_sync(self, order_id: str) -> Optional[OrderState]:
+        """根据订单ID获取订单（同步版本，单次字典读取无需加锁）"""
+        return self.orders.get(order_id)
             
     async def cancel_all_orders(self) -> List[str]:
         """撤销所有活跃订单"""
@@ -390,16 +427,20 @@ class OrderManager:
         if order_id in self.orders:
             order = self.orders[order_id]
             
-            # 移除映射
+            # 移除映射和价格索引
             if order.client_order_id in self.client_order_mapping:
                 del self.client_order_mapping[order.client_order_id]
+            self._unindex_order(order_id)
                 
             # 可以选择移除订单或保留一段时间
             # 这里选择保留2小时用于查询
-            asyncio.create_task(self._cleanup_order_later(order_id, 7200))
+            task = asyncio.create_task(self._cleanup_order_later(order_id, 7200))
+            self._cleanup_tasks.add(task)
+            task.add_done_callback(self._cleanup_tasks.discard)
             
     async def _cleanup_order_later(self, order_id: str, delay: int) -> None:
         """延迟清理订单"""
         await asyncio.sleep(delay)
         if order_id in self.orders:
-            del self.orders[order_id] 
\ No newline at end of file
+            del self.orders[order_id]
+            self._unindex_order(order_id) 
\ No newline at end of file
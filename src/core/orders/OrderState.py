@@ -1,9 +1,9 @@
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, List, Optional
-import asyncio
+from typing import Optional
 import time
 from decimal import Decimal
+from ...utils.pricing.PriceTicks import to_ticks_exact
 
 class OrderStatus(Enum):
     PENDING_NEW = "PENDING_NEW"
@@ -14,10 +14,21 @@ class OrderStatus(Enum):
     CANCELLED = "CANCELLED"
     REJECTED = "REJECTED"
     EXPIRED = "EXPIRED"
+    PENDING_MODIFY = "PENDING_MODIFY"
+
+_ACTIVE_STATUSES = frozenset((OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED))
 
 @dataclass
 class OrderState:
     """订单状态对象"""
+    # 显式声明__slots__（兼容3.8，字段均无默认值），实例不带__dict__；
+    # _price_str/_qty_str/_price_ticks 为首次使用时计算的缓存，未计算前槽位为空；
+    # 缓存不随字段写入自动失效，订单价格和数量须通过 set_price/set_quantity 修改
+    __slots__ = ('order_id', 'client_order_id', 'symbol', 'side', 'price',
+                 'original_quantity', 'executed_quantity', 'status',
+                 'create_time', 'update_time', 'last_event_time',
+                 '_price_str', '_qty_str', '_price_ticks')
+    
     order_id: str
     client_order_id: str
     symbol: str
@@ -30,141 +41,61 @@ class OrderState:
     update_time: float
     last_event_time: float
     
+    def set_price(self, price: Decimal) -> None:
+        """修改价格，并清除tick价格和价格字符串缓存"""
+        self.price = price
+        self._price_ticks = None
+        self._price_str = None
+        
+    def set_quantity(self, quantity: Decimal) -> None:
+        """修改数量，并清除数量字符串缓存"""
+        self.original_quantity = quantity
+        self._qty_str = None
+        
     @property
     def remaining_quantity(self) -> Decimal:
         return self.original_quantity - self.executed_quantity
         
     @property
     def is_active(self) -> bool:
-        return self.status in [OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED]
+        return self.status in _ACTIVE_STATUSES
         
     @property
     def order_value(self) -> Decimal:
         return self.price * self.original_quantity
-
-class OrderManager:
-    def __init__(self, event_bus):
-        self.orders: Dict[str, OrderState] = {}
-        self.client_order_mapping: Dict[str, str] = {}
-        self.event_bus = event_bus
-        self._lock = asyncio.Lock()
         
-    async def add_order(self, order: OrderState) -> None:
-        """添加新订单"""
-        async with self._lock:
-            self.orders[order.order_id] = order
-            self.client_order_mapping[order.client_order_id] = order.order_id
-            
-            # 发布订单状态事件
-            from ..events.EventType import OrderStatusEvent, EventType
-            await self.event_bus.publish(OrderStatusEvent(
-                event_type=EventType.ORDER_STATUS,
-                timestamp=time.time(),
-                data={},
-                order_id=order.order_id,
-                status=str(order.status),
-                order_data={
-                    'order_id': order.order_id,
-                    'client_order_id': order.client_order_id,
-                    'symbol': order.symbol,
-                    'side': order.side,
-                    'price': str(order.price),
-                    'original_quantity': str(order.original_quantity),
-                    'executed_quantity': str(order.executed_quantity),
-                    'status': str(order.status),
-                    'create_time': order.create_time,
-                    'update_time': order.update_time,
-                    'last_event_time': order.last_event_time
-                }
-            ))
-            
-    async def update_order_status(self, order_id: str, new_status: OrderStatus,
-                                executed_qty: Decimal = None) -> None:
-        """更新订单状态"""
-        async with self._lock:
-            if order_id not in self.orders:
-                return
-                
-            order = self.orders[order_id]
-            old_status = order.status
-            
-            order.status = new_status
-            order.update_time = time.time()
-            
-            if executed_qty is not None:
-                order.executed_quantity += executed_qty
-                
-            # 发布状态变更事件
-            from ..events.EventType import OrderStatusEvent, EventType
-            await self.event_bus.publish(OrderStatusEvent(
-                event_type=EventType.ORDER_STATUS,
-                timestamp=time.time(),
-                data={},
-                order_id=order_id,
-                status=str(new_status),
-                old_status=str(old_status),
-                order_data={
-                    'order_id': order.order_id,
-                    'client_order_id': order.client_order_id,
-                    'symbol': order.symbol,
-                    'side': order.side,
-                    'price': str(order.price),
-                    'original_quantity': str(order.original_quantity),
-                    'executed_quantity': str(order.executed_quantity),
-                    'status': str(order.status),
-                    'create_time': order.create_time,
-                    'update_time': order.update_time,
-                    'last_event_time': order.last_event_time
-                }
-            ))
-            
-            # 清理已完成的订单
-            if new_status in [OrderStatus.FILLED, OrderStatus.CANCELLED, 
-                            OrderStatus.REJECTED, OrderStatus.EXPIRED]:
-                await self._archive_order(order_id)
-                
-    async def get_active_orders(self, side: str = None) -> List[OrderState]:
-        """获取活跃订单"""
-        async with self._lock:
-            active_orders = [
-                order for order in self.orders.values()
-                if order.is_active
-            ]
-            
-            if side:
-                active_orders = [o for o in active_orders if o.side == side]
-                
-            return active_orders
-            
-    async def get_orders_by_price_range(self, min_price: Decimal, 
-                                      max_price: Decimal) -> List[OrderState]:
-        """根据价格范围获取订单"""
-        async with self._lock:
-            return [
-                order for order in self.orders.values()
-                if order.is_active and min_price <= order.price <= max_price
-            ]
-            
-    async def get_order_by_id(self, order_id: str) -> Optional[OrderState]:
-        """根据订单ID获取订单"""
-        async with self._lock:
-            return self.orders.get(order_id)
-            
-    async def _archive_order(self, order_id: str) -> None:
-        """归档已完成的订单"""
-        if order_id in self.orders:
-            order = self.orders[order_id]
-            
-            # 移除映射
-            if order.client_order_id in self.client_order_mapping:
-                del self.client_order_mapping[order.client_order_id]
-                
-            # 可以选择移除订单或保留一段时间
-            # 这里选择保留2小时用于查询
-            asyncio.create_task(self._cleanup_order_later(order_id, 7200))
-            
-    async def _cleanup_order_later(self, order_id: str, delay: int) -> None:
-        """延迟清理订单"""
-        await asyncio.sleep(delay)
-        if order_id in self.orders:
-            del self.orders[order_id]
+    @property
+    def price_str(self) -> str:
+        """下单用的价格字符串，首次使用时格式化，重试时复用"""
+        price_str = getattr(self, '_price_str', None)
+        if price_str is None:
+            price_str = self._price_str = format(self.price, 'f')
+        return price_str
+        
+    @property
+    def qty_str(self) -> str:
+        """下单用的数量字符串，首次使用时格式化，重试时复用"""
+        qty_str = getattr(self, '_qty_str', None)
+        if qty_str is None:
+            qty_str = self._qty_str = format(self.original_quantity, 'f')
+        return qty_str
+        
+    @property
+    def price_ticks(self) -> int:
+        """价格的整数tick形式（价格 × PRICE_SCALE），首次使用时计算；价格精度细于1 tick时抛出ValueError"""
+        price_ticks = getattr(self, '_price_ticks', None)
+        if price_ticks is None:
+            price_ticks = self._price_ticks = to_ticks_exact(self.price)
+        return price_ticks
+
+@dataclass
+class ModifyOrderRequest:
+    """改单请求"""
+    order_id: str
+    new_price: Optional[Decimal] = None
+    new_quantity: Optional[Decimal] = None
+    timestamp: float = None
+    
+    def __post_init__(self):
+        if self.timestamp is None:
+            self.timestamp = time.time()
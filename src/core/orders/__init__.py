@@ -3,7 +3,8 @@
 Order management system
 """
 
-from .OrderState import OrderState, OrderStatus, OrderManager
+from .OrderState import OrderState, OrderStatus
+from .OrderManager import OrderManager
 from .OrderAnalysis import OrderAnalysis
 from .OrderDecision import OrderDecision, PlaceOrderDecision, CancelOrderDecision
 
@@ -24,7 +24,8 @@ class ExecutionEngine:
         self.exchange_api = ExchangeAPI(
             api_key="",  # 从配置中获取
             api_secret="",  # 从配置中获取
-            testnet=True  # 从配置中获取
+            testnet=True,  # 从配置中获取
+            request_timeout=config.request_timeout
         )
         self.symbol = config.symbol
         self.logger = logging.getLogger(__name__)
@@ -85,9 +86,8 @@ class ExecutionEngine:
             update_time=time.time(),
             last_event_time=time.time()
         )
-        
-        # 添加到订单管理器
-        await self.order_manager.add_order(order_state)
+        # 同步写入订单管理器（不等待锁），执行任务更新状态时订单已存在
+        self.order_manager.submit_order(order_state)
         
         # 创建执行任务
         task = ExecutionTask(
@@ -101,7 +101,7 @@ class ExecutionEngine:
         
     async def handle_cancel_order(self, event: CancelOrderEvent) -> None:
         """处理撤单请求"""
-        order = await self.order_manager.get_order_by_id(event.order_id)
+        order = self.order_manager.get_order_by_id_sync(event.order_id)
         if not order or not order.is_active:
             return
             
@@ -171,6 +171,7 @@ class ExecutionEngine:
         
     async def _modify_worker(self) -> None:
         """改单工作器"""
+        consecutive_failures = 0
         while True:
             try:
                 task = await self.modify_queue.get()
@@ -182,13 +183,16 @@ class ExecutionEngine:
                 await self._execute_modify_order(task)
                 
                 self.modify_queue.task_done()
+                consecutive_failures = 0
                 
             except Exception as e:
+                consecutive_failures += 1
                 self.logger.error(f"Modify worker error: {e}")
-                await asyncio.sleep(1)
+                await asyncio.sleep(self._worker_backoff_delay(consecutive_failures))
                 
     async def _execution_worker(self, worker_name: str) -> None:
         """执行工作器"""
+        consecutive_failures = 0
         while True:
             try:
                 task = await self.execution_queue.get()
@@ -200,10 +204,16 @@ class ExecutionEngine:
                 await self._execute_task(task, worker_name)
                 
                 self.execution_queue.task_done()
+                consecutive_failures = 0
                 
             except Exception as e:
+                consecutive_failures += 1
                 self.logger.error(f"Worker {worker_name} error: {e}")
-                await asyncio.sleep(1)
+                await asyncio.sleep(self._worker_backoff_delay(consecutive_failures))
+                
+    def _worker_backoff_delay(self, consecutive_failures: int) -> float:
+        """工作器连续出错时的退避时间（指数退避 + 随机抖动，上限30秒）"""
+        return random.uniform(0, min(30.0, 0.1 * (2 ** consecutive_failures)))
                 
     async def _batch_processor(self) -> None:
         """批处理器"""
@@ -245,12 +255,12 @@ class ExecutionEngine:
         
         try:
             # 调用交易所改单API
-            response = await self.exchange_api.modify_order(
+            response = await self._call_exchange(self.exchange_api.modify_order(
                 symbol=order_data.symbol,
                 orderId=order_data.order_id,
                 new_price=modify_data.get('new_price'),
                 new_quantity=modify_data.get('new_quantity')
-            )
+            ))
             
             # 改单成功
             await self.order_manager.apply_modification(order_data.order_id, True)
@@ -273,18 +283,18 @@ class ExecutionEngine:
         """执行下单"""
         order_data = task.order_data
         
-        response = await self.exchange_api.place_order(
+        response = await self._call_exchange(self.exchange_api.place_order(
             symbol=order_data.symbol,
             side=order_data.side,
             type='LIMIT',
-            quantity=str(order_data.original_quantity),
-            price=str(order_data.price),
+            quantity=order_data.qty_str,
+            price=order_data.price_str,
             timeInForce='GTC',
             newClientOrderId=order_data.client_order_id
-        )
+        ))
         
-        # 更新订单状态
-        order_data.order_id = response['orderId']
+        # 以交易所订单ID登记订单并更新状态
+        self.order_manager.bind_order_id(order_data.client_order_id, response['orderId'])
         await self.order_manager.update_order_status(
             order_data.order_id, OrderStatus.ACTIVE
         )
@@ -293,13 +303,17 @@ class ExecutionEngine:
         """执行撤单"""
         order_data = task.order_data
         
-        await self.exchange_api.cancel_order(
+        await self._call_exchange(self.exchange_api.cancel_order(
             symbol=order_data.symbol,
             orderId=order_data.order_id
-        )
+        ))
         
         # 状态更新由WebSocket回报处理
         
+    async def _call_exchange(self, coro):
+        """带超时的交易所调用，超时抛出 asyncio.TimeoutError 由调用方按失败重试"""
+        return await asyncio.wait_for(coro, timeout=self.config.request_timeout)
+        
     def _generate_client_order_id(self) -> str:
         """生成客户端订单ID"""
         timestamp = int(time.time() * 1000)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
-from ..core.orders.OrderManager import OrderState
+from ..core.orders.OrderState import OrderState
 
 @dataclass
 class ExecutionTask:
@@ -2,20 +2,44 @@ import asyncio
 import aiohttp
 import hmac
 import hashlib
+import ssl
 import time
 import json
+import logging
 from typing import Dict, Any, Optional
 from decimal import Decimal
 
+def _sha256_is_accelerated() -> bool:
+    """检查 hashlib.sha256 是否由 OpenSSL (>=1.1.1) 提供，从而可使用 SHA-NI 硬件加速"""
+    return (ssl.OPENSSL_VERSION_INFO >= (1, 1, 1)
+            and hashlib.sha256.__name__ == 'openssl_sha256')
+
 class ExchangeAPI:
     """交易所API接口"""
     
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False,
+                 request_timeout: float = 10.0):
         self.api_key = api_key
         self.api_secret = api_secret
+        self._secret_key = api_secret.encode('utf-8')
+        self.logger = logging.getLogger(__name__)
+        
+        if not _sha256_is_accelerated():
+            self.logger.warning(
+                f"hashlib.sha256 未使用 OpenSSL 实现 ({ssl.OPENSSL_VERSION})，签名性能将下降"
+            )
         self.base_url = "https://testnet.binance.vision" if testnet else "https://api.binance.com"
         self.ws_url = "wss://testnet.binance.vision/ws" if testnet else "wss://stream.binance.com:9443/ws"
         
+        # 预先拼接常用URL和签名请求头，避免每次请求重复构造
+        self._endpoints = {
+            endpoint: self.base_url + endpoint
+            for endpoint in ('/api/v3/order', '/api/v3/account',
+                             '/api/v3/exchangeInfo', '/api/v3/ticker/price')
+        }
+        self._signed_headers = {'X-MBX-APIKEY': api_key}
+        self._client_timeout = aiohttp.ClientTimeout(total=request_timeout)
+        
     async def place_order(self, symbol: str, side: str, type: str, 
                          quantity: str, price: str = None, 
                          timeInForce: str = 'GTC', 
@@ -120,18 +144,14 @@ class ExchangeAPI:
         # 生成签名
         query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
         signature = hmac.new(
-            self.api_secret.encode('utf-8'),
+            self._secret_key,
             query_string.encode('utf-8'),
             hashlib.sha256
         ).hexdigest()
         
         params['signature'] = signature
         
-        headers = {
-            'X-MBX-APIKEY': self.api_key
-        }
-        
-        return await self._make_request(method, endpoint, params, headers)
+        return await self._make_request(method, endpoint, params, self._signed_headers)
         
     async def _public_request(self, method: str, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """公开请求"""
@@ -140,9 +160,9 @@ class ExchangeAPI:
     async def _make_request(self, method: str, endpoint: str, params: Dict[str, Any], 
                            headers: Dict[str, str] = None) -> Dict[str, Any]:
         """发送HTTP请求"""
-        url = f"{self.base_url}{endpoint}"
+        url = self._endpoints.get(endpoint) or f"{self.base_url}{endpoint}"
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(timeout=self._client_timeout) as session:
             if method == 'GET':
                 async with session.get(url, params=params, headers=headers) as response:
                     return await response.json()
@@ -1,32 +1,75 @@
 import asyncio
 import json
+import time
 import websockets
 import logging
+from collections import deque
 from typing import Dict, Any, Optional
 from decimal import Decimal
+import numpy as np
 from ...core.events.EventBus import EventBus
 from ...core.events.EventType import EventType, BaseEvent, PriceUpdateEvent
 from ...config.Configs import MasterConfig
+from ...utils.pricing.PriceTicks import PRICE_SCALE, ticks_to_decimal
+
+try:
+    import orjson
+    json_loads = orjson.loads  # 比标准库json快，可直接解析bytes
+except ImportError:  # orjson为可选依赖，缺失时回退到标准库
+    json_loads = json.loads
+
+TRADE_WINDOW = 100  # 保留的最近交易笔数
+MESSAGE_QUEUE_SIZE = 1024  # 待处理WebSocket消息队列容量
+DEPTH_COALESCE_INTERVAL = 0.05  # 最优价不变时，深度事件的最小发布间隔（秒）
+_DOUBLE_PRICE_SCALE = Decimal(2 * PRICE_SCALE)
 
 class MarketData:
     """市场数据对象"""
     def __init__(self):
         self.symbol = ""
-        self.bid_price = Decimal('0')
-        self.ask_price = Decimal('0')
+        # 最优买卖价以整数tick保存，Decimal形式按需转换
+        self.bid_ticks = 0
+        self.ask_ticks = 0
         self.mid_price = Decimal('0')
         self.last_price = Decimal('0')
         self.volume_24h = Decimal('0')
         self.price_change_24h = Decimal('0')
-        self.recent_trades = []
+        self.recent_trades = deque(maxlen=TRADE_WINDOW)  # 最近100笔交易，超出自动丢弃最旧的
         self.order_book = {'bids': [], 'asks': []}
+        
+        # 最近交易的float64环形缓冲区，供参考价格引擎向量化计算
+        self.trade_prices = np.zeros(TRADE_WINDOW)
+        self.trade_volumes = np.zeros(TRADE_WINDOW)
+        self.trade_timestamps = np.zeros(TRADE_WINDOW)
+        self.trade_count = 0
+        self._trade_index = 0
+        
+    def add_trade(self, trade: 'Trade', price: float, volume: float) -> None:
+        """记录一笔交易（price/volume为已转换的float值）"""
+        self.recent_trades.append(trade)
+        
+        idx = self._trade_index
+        self.trade_prices[idx] = price
+        self.trade_volumes[idx] = volume
+        self.trade_timestamps[idx] = trade.timestamp
+        self._trade_index = (idx + 1) % TRADE_WINDOW
+        if self.trade_count < TRADE_WINDOW:
+            self.trade_count += 1
+            
+    @property
+    def bid_price(self) -> Decimal:
+        return ticks_to_decimal(self.bid_ticks)
+        
+    @property
+    def ask_price(self) -> Decimal:
+        return ticks_to_decimal(self.ask_ticks)
 
 class Trade:
     """交易对象"""
     def __init__(self, price: Decimal, volume: Decimal, timestamp: float = None):
         self.price = price
         self.volume = volume
-        self.timestamp = timestamp or asyncio.get_event_loop().time()
+        self.timestamp = timestamp or time.time()
 
 class MarketDataGateway:
     """市场数据网关"""
@@ -39,29 +82,60 @@ class MarketDataGateway:
         self.running = False
         self.logger = logging.getLogger(__name__)
         self.current_market_data = MarketData()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # 接收与处理解耦：接收循环只入队，消费者负责解析和发布
+        self._in_queue: Optional[asyncio.Queue] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+        self.messages_dropped = 0
+        
+        # 深度事件合并发布：合并期间暂存最新快照，间隔结束时补发
+        self._last_depth_publish = 0.0
+        self._pending_depth = None
+        self._depth_flush_handle: Optional[asyncio.TimerHandle] = None
         
     async def start(self) -> None:
         """启动市场数据网关"""
         self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._in_queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+        self._consumer_task = asyncio.create_task(self._consume_messages())
         asyncio.create_task(self._connect_websocket())
         self.logger.info(f"Market data gateway started for {self.symbol}")
         
     async def stop(self) -> None:
         """停止市场数据网关"""
         self.running = False
+        if self._depth_flush_handle is not None:
+            self._depth_flush_handle.cancel()
+            self._depth_flush_handle = None
+        if self._consumer_task:
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
         self.logger.info("Market data gateway stopped")
         
     async def _connect_websocket(self) -> None:
         """连接WebSocket"""
         while self.running:
             try:
-                async with websockets.connect(self.ws_url) as websocket:
+                # 显式开启permessage-deflate压缩，深度数据重复度高，压缩可显著减少传输量
+                async with websockets.connect(
+                    self.ws_url,
+                    compression="deflate",
+                    max_size=2 ** 20,
+                    ping_interval=20,
+                    ping_timeout=10,
+                    close_timeout=1
+                ) as websocket:
                     self.logger.info(f"Connected to Binance WebSocket for {self.symbol}")
                     
                     while self.running:
                         try:
                             message = await websocket.recv()
-                            await self._process_message(json.loads(message))
+                            self._enqueue_message(message)
                         except websockets.exceptions.ConnectionClosed:
                             self.logger.warning("WebSocket connection closed, reconnecting...")
                             break
@@ -72,6 +146,26 @@ class MarketDataGateway:
                 self.logger.error(f"WebSocket connection error: {e}")
                 await asyncio.sleep(5)  # 重连延迟
                 
+    def _enqueue_message(self, message) -> None:
+        """原始消息入队，队列满时丢弃最旧的消息，保证接收循环不被阻塞"""
+        try:
+            self._in_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._in_queue.get_nowait()
+            self._in_queue.put_nowait(message)
+            self.messages_dropped += 1
+            
+    async def _consume_messages(self) -> None:
+        """消息消费者"""
+        while True:
+            message = await self._in_queue.get()
+            try:
+                await self._process_message(json_loads(message))
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"Invalid JSON message: {e}")
+            except Exception as e:
+                self.logger.error(f"Error processing message: {e}")
+                
     async def _process_message(self, message: Dict[str, Any]) -> None:
         """处理WebSocket消息"""
         try:
@@ -90,75 +184,108 @@ class MarketDataGateway:
             
     async def _process_ticker(self, data: Dict[str, Any]) -> None:
         """处理Ticker数据"""
+        # Binance的价格/数量字段均为字符串，可直接构造Decimal
         self.current_market_data.symbol = data['s']
-        self.current_market_data.last_price = Decimal(str(data['c']))
-        self.current_market_data.volume_24h = Decimal(str(data['v']))
-        self.current_market_data.price_change_24h = Decimal(str(data['P']))
+        self.current_market_data.last_price = Decimal(data['c'])
+        self.current_market_data.volume_24h = Decimal(data['v'])
+        self.current_market_data.price_change_24h = Decimal(data['P'])
         
-        # 计算中间价
-        if self.current_market_data.bid_price > 0 and self.current_market_data.ask_price > 0:
-            self.current_market_data.mid_price = (
-                self.current_market_data.bid_price + self.current_market_data.ask_price
-            ) / 2
+        # 计算中间价（整数tick运算，仅在发布时转换为Decimal）
+        market_data = self.current_market_data
+        if market_data.bid_ticks > 0 and market_data.ask_ticks > 0:
+            mid_ticks_x2 = market_data.bid_ticks + market_data.ask_ticks
+            market_data.mid_price = Decimal(mid_ticks_x2) / _DOUBLE_PRICE_SCALE
             
-            # 发布价格更新事件
-            await self.event_bus.publish(PriceUpdateEvent(
+            # 发布价格更新事件（非阻塞，不等待事件总线）
+            self.event_bus.publish_nowait(PriceUpdateEvent(
                 event_type=EventType.PRICE_UPDATE,
-                timestamp=asyncio.get_event_loop().time(),
+                timestamp=self._loop.time(),
                 data={'symbol': self.symbol},
-                reference_price=self.current_market_data.mid_price,
-                price_change=self.current_market_data.price_change_24h,
+                reference_price=market_data.mid_price,
+                price_change=market_data.price_change_24h,
                 confidence=0.95
             ))
             
     async def _process_depth(self, data: Dict[str, Any]) -> None:
         """处理深度数据"""
-        bids = [[Decimal(str(price)), Decimal(str(qty))] for price, qty in data['b']]
-        asks = [[Decimal(str(price)), Decimal(str(qty))] for price, qty in data['a']]
+        # 深度档位只转换为float一次，最优买卖价由float转换为整数tick
+        raw_bids = data['b']
+        raw_asks = data['a']
+        bids = [[float(price), float(qty)] for price, qty in raw_bids]
+        asks = [[float(price), float(qty)] for price, qty in raw_asks]
         
-        self.current_market_data.order_book['bids'] = bids
-        self.current_market_data.order_book['asks'] = asks
+        market_data = self.current_market_data
+        market_data.order_book['bids'] = bids
+        market_data.order_book['asks'] = asks
+        old_bid_ticks = market_data.bid_ticks
+        old_ask_ticks = market_data.ask_ticks
         
         # 更新买卖价格
         if bids:
-            self.current_market_data.bid_price = bids[0][0]
+            market_data.bid_ticks = round(bids[0][0] * PRICE_SCALE)
         if asks:
-            self.current_market_data.ask_price = asks[0][0]
+            market_data.ask_ticks = round(asks[0][0] * PRICE_SCALE)
+            
+        # 最优价未变且距上次发布不足合并间隔时，暂存快照，在间隔结束时发布最新的一份
+        now = self._loop.time()
+        if (now - self._last_depth_publish < DEPTH_COALESCE_INTERVAL
+                and old_bid_ticks == market_data.bid_ticks
+                and old_ask_ticks == market_data.ask_ticks):
+            self._pending_depth = (bids, asks)
+            if self._depth_flush_handle is None:
+                self._depth_flush_handle = self._loop.call_later(
+                    self._last_depth_publish + DEPTH_COALESCE_INTERVAL - now, self._flush_depth
+                )
+            return
+        self._publish_depth(bids, asks, now)
+        
+    def _flush_depth(self) -> None:
+        """合并间隔结束，发布期间暂存的最新深度快照"""
+        self._depth_flush_handle = None
+        pending = self._pending_depth
+        if pending is not None:
+            self._publish_depth(pending[0], pending[1], self._loop.time())
+            
+    def _publish_depth(self, bids: list, asks: list, now: float) -> None:
+        """发布深度快照，并清除暂存快照和待执行的补发"""
+        self._last_depth_publish = now
+        self._pending_depth = None
+        if self._depth_flush_handle is not None:
+            self._depth_flush_handle.cancel()
+            self._depth_flush_handle = None
             
         # 发布深度更新事件
-        await self.event_bus.publish(BaseEvent(
+        self.event_bus.publish_nowait(BaseEvent(
             event_type=EventType.MARKET_DEPTH,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=now,
             data={
                 'symbol': self.symbol,
-                'bids': [[float(price), float(qty)] for price, qty in bids],
-                'asks': [[float(price), float(qty)] for price, qty in asks]
+                'bids': bids,
+                'asks': asks
             }
         ))
         
     async def _process_trade(self, data: Dict[str, Any]) -> None:
         """处理交易数据"""
+        price = float(data['p'])
+        volume = float(data['q'])
         trade = Trade(
-            price=Decimal(str(data['p'])),
-            volume=Decimal(str(data['q'])),
+            price=Decimal(data['p']),
+            volume=Decimal(data['q']),
             timestamp=data['T'] / 1000.0
         )
         
-        # 添加到最近交易列表
-        self.current_market_data.recent_trades.append(trade)
-        
-        # 保持最近100笔交易
-        if len(self.current_market_data.recent_trades) > 100:
-            self.current_market_data.recent_trades.pop(0)
+        # 添加到最近交易（自动保持最近100笔）
+        self.current_market_data.add_trade(trade, price, volume)
             
         # 发布交易事件
-        await self.event_bus.publish(BaseEvent(
+        self.event_bus.publish_nowait(BaseEvent(
             event_type=EventType.MARKET_TRADE,
-            timestamp=asyncio.get_event_loop().time(),
+            timestamp=self._loop.time(),
             data={
                 'symbol': self.symbol,
-                'price': float(trade.price),
-                'volume': float(trade.volume),
+                'price': price,
+                'volume': volume,
                 'timestamp': trade.timestamp
             }
         )) 
\ No newline at end of file
@@ -7,14 +7,9 @@ from ...core.events.EventBus import EventBus
 from .RiskConfig import RiskConfig
 from .RiskLevel import RiskLevel
 from ...core.events.EventType import OrderStatusEvent, PriceUpdateEvent, BaseEvent, EventType
-import uuid
 
 class RiskEvent(BaseEvent):
     """风险事件"""
-    correlation_id: str = None
-    def __post_init__(self):
-        if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
     def __init__(self, risk_type: str, risk_level: RiskLevel, details: dict, **kwargs):
         super().__init__(
             event_type=EventType.RISK_WARNING,
@@ -22,14 +17,9 @@ class RiskEvent(BaseEvent):
             data={'risk_type': risk_type, 'risk_level': risk_level.value, 'details': details},
             **kwargs
         )
-        self.__post_init__()
 
 class EmergencyStopEvent(BaseEvent):
     """紧急停止事件"""
-    correlation_id: str = None
-    def __post_init__(self):
-        if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
     def __init__(self, reason: str, timestamp: float, **kwargs):
         super().__init__(
             event_type=EventType.EMERGENCY_STOP,
@@ -37,14 +27,9 @@ class EmergencyStopEvent(BaseEvent):
             data={'reason': reason},
             **kwargs
         )
-        self.__post_init__()
 
 class CancelAllOrdersEvent(BaseEvent):
     """撤销所有订单事件"""
-    correlation_id: str = None
-    def __post_init__(self):
-        if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
     def __init__(self, **kwargs):
         super().__init__(
             event_type=EventType.CANCEL_ALL_ORDERS,
@@ -52,14 +37,9 @@ class CancelAllOrdersEvent(BaseEvent):
             data={},
             **kwargs
         )
-        self.__post_init__()
 
 class TradeEvent(BaseEvent):
     """交易事件"""
-    correlation_id: str = None
-    def __post_init__(self):
-        if self.correlation_id is None:
-            self.correlation_id = str(uuid.uuid4())
     def __init__(self, symbol: str, price: Decimal, quantity: Decimal, side: str, **kwargs):
         super().__init__(
             event_type=EventType.ORDER_FILL,
@@ -67,7 +47,6 @@ class TradeEvent(BaseEvent):
             data={'symbol': symbol, 'price': float(price), 'quantity': float(quantity), 'side': side},
             **kwargs
         )
-        self.__post_init__()
 
 class RiskManager:
     def __init__(self, config: RiskConfig, event_bus: EventBus):
@@ -86,17 +65,42 @@ class RiskManager:
         self.risk_level = RiskLevel.NORMAL
         self.emergency_mode = False
         
+        # 回调为同步方法，风险事件以后台任务方式发布
+        self._loop = None
+        self._publish_tasks = set()
+        self._check_task = None
+        self._subscriptions = []
+        
     async def start(self) -> None:
         """启动风险管理器"""
+        self._loop = asyncio.get_running_loop()
+        
         # 订阅相关事件
-        await self.event_bus.subscribe(EventType.ORDER_STATUS, self.on_order_status)
-        await self.event_bus.subscribe(EventType.PRICE_UPDATE, self.on_price_update)
-        await self.event_bus.subscribe(EventType.ORDER_FILL, self.on_trade)
+        for event_type, callback in ((EventType.ORDER_STATUS, self.on_order_status),
+                                     (EventType.PRICE_UPDATE, self.on_price_update),
+                                     (EventType.ORDER_FILL, self.on_trade)):
+            subscription_id = await self.event_bus.subscribe(event_type, callback)
+            self._subscriptions.append((event_type, subscription_id))
         
         # 启动定期检查
-        asyncio.create_task(self._periodic_risk_check())
+        self._check_task = asyncio.create_task(self._periodic_risk_check())
+        
+    async def stop(self) -> None:
+        """停止风险管理器：取消订阅、定期检查和未完成的发布任务"""
+        for event_type, subscription_id in self._subscriptions:
+            await self.event_bus.unsubscribe(event_type, subscription_id)
+        self._subscriptions.clear()
         
-    async def on_order_status(self, event: OrderStatusEvent) -> None:
+        tasks = list(self._publish_tasks)
+        if self._check_task is not None:
+            tasks.append(self._check_task)
+            self._check_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.logger.info("风险管理器已停止")
+        
+    def on_order_status(self, event: OrderStatusEvent) -> None:
         """处理订单状态事件"""
         if event.status == OrderStatus.FILLED:
             # 更新持仓
@@ -106,9 +110,9 @@ class RiskManager:
                 self.current_position -= event.order_data.executed_quantity
                 
             # 检查持仓风险
-            await self._check_position_risk()
+            self._check_position_risk()
             
-    async def on_price_update(self, event: PriceUpdateEvent) -> None:
+    def on_price_update(self, event: PriceUpdateEvent) -> None:
         """处理价格更新事件"""
         self.last_price = event.reference_price
         
@@ -117,14 +121,14 @@ class RiskManager:
             self.unrealized_pnl = self.current_position * self.last_price
             
         # 检查价格风险
-        await self._check_price_risk()
+        self._check_price_risk()
         
-    async def on_trade(self, event: TradeEvent) -> None:
+    def on_trade(self, event: TradeEvent) -> None:
         """处理交易事件"""
         # 更新订单计数
         self.order_count += 1
         
-    async def _check_position_risk(self) -> None:
+    def _check_position_risk(self) -> None:
         """检查持仓风险"""
         max_position = self.config.max_position
         
@@ -132,7 +136,7 @@ class RiskManager:
             self.risk_level = RiskLevel.HIGH
             
             # 发布风险事件
-            await self.event_bus.publish(RiskEvent(
+            self._publish_nowait(RiskEvent(
                 risk_type='POSITION_LIMIT_EXCEEDED',
                 risk_level=RiskLevel.HIGH,
                 details={
@@ -142,9 +146,9 @@ class RiskManager:
             ))
             
             # 触发紧急措施
-            await self._trigger_emergency_measures()
+            self._trigger_emergency_measures()
             
-    async def _check_price_risk(self) -> None:
+    def _check_price_risk(self) -> None:
         """检查价格风险"""
         if self.last_price is None:
             return
@@ -156,7 +160,7 @@ class RiskManager:
             if price_change > self.config.max_price_change:
                 self.risk_level = RiskLevel.HIGH
                 
-                await self.event_bus.publish(RiskEvent(
+                self._publish_nowait(RiskEvent(
                     risk_type='PRICE_VOLATILITY_HIGH',
                     risk_level=RiskLevel.HIGH,
                     details={
@@ -167,7 +171,7 @@ class RiskManager:
                 
         self.previous_price = self.last_price
         
-    async def _trigger_emergency_measures(self) -> None:
+    def _trigger_emergency_measures(self) -> None:
         """触发紧急措施"""
         if self.emergency_mode:
             return
@@ -175,13 +179,20 @@ class RiskManager:
         self.emergency_mode = True
         
         # 发布紧急停止事件
-        await self.event_bus.publish(EmergencyStopEvent(
+        self._publish_nowait(EmergencyStopEvent(
             reason='RISK_LIMIT_EXCEEDED',
             timestamp=time.time()
         ))
         
         # 撤销所有订单
-        await self.event_bus.publish(CancelAllOrdersEvent())
+        self._publish_nowait(CancelAllOrdersEvent())
+        
+    def _publish_nowait(self, event: BaseEvent) -> None:
+        """以后台任务发布事件，不阻塞同步回调"""
+        loop = self._loop or asyncio.get_running_loop()
+        task = loop.create_task(self.event_bus.publish(event))
+        self._publish_tasks.add(task)
+        task.add_done_callback(self._publish_tasks.discard)
         
     async def _periodic_risk_check(self) -> None:
         """定期风险检查"""
@@ -190,7 +201,7 @@ class RiskManager:
                 await self._comprehensive_risk_check()
                 await asyncio.sleep(self.config.check_interval)
             except Exception as e:
-                self.logger.error(f"Risk check error: {e}")
+                self.logger.error("Risk check error: %s", e)
                 await asyncio.sleep(10)
                 
     async def _comprehensive_risk_check(self) -> None:
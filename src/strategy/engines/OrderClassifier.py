@@ -0,0 +1,53 @@
+"""
+订单分类
+Per-order classification for StrategyEngine analysis
+
+该模块只包含纯函数，不依赖事件循环和引擎状态，
+从引擎中抽出以便单独测试。
+"""
+
+from decimal import Decimal
+from typing import List, Tuple
+from ...core.orders.OrderState import OrderState
+
+def classify_orders(orders: List[OrderState], reference_price: Decimal,
+                    drift_threshold: Decimal, max_modify_deviation: Decimal,
+                    close_threshold: Decimal, modify_threshold: Decimal
+                    ) -> Tuple[List[str], List[OrderState], int, int]:
+    """按价格偏差对订单分类
+
+    返回 (需要撤销的订单ID列表, 需要改单的订单列表, 买单数量, 卖单数量)
+    """
+    orders_to_cancel: List[str] = []
+    orders_to_modify: List[OrderState] = []
+    bid_count = 0
+    ask_count = 0
+    # 参考价格在循环内不变，预先求倒数以乘法代替除法
+    inv_ref = Decimal(1) / reference_price
+
+    for order in orders:
+        # 统计买卖单数量
+        side = order.side
+        if side == 'BUY':
+            bid_count += 1
+        elif side == 'SELL':
+            ask_count += 1
+
+        # 计算价格偏差
+        price_deviation = abs(order.price - reference_price) * inv_ref
+
+        # 检查是否需要调整
+        if price_deviation > drift_threshold:
+            # 在改单范围内尝试改单，偏差太大则撤单
+            if price_deviation <= max_modify_deviation:
+                orders_to_modify.append(order)
+            else:
+                orders_to_cancel.append(order.order_id)
+        elif price_deviation < close_threshold:  # 过于接近
+            # 偏差足够时改单调整，否则撤单
+            if price_deviation >= modify_threshold:
+                orders_to_modify.append(order)
+            else:
+                orders_to_cancel.append(order.order_id)
+
+    return orders_to_cancel, orders_to_modify, bid_count, ask_count
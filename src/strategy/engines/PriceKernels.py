@@ -0,0 +1,32 @@
+"""
+参考价格计算内核
+Reference price reduction kernels (Numba JIT when available)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba为可选依赖，缺失时回退到NumPy实现
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def weighted_sum(values, weights):
+        """返回 (sum(values * weights), sum(weights))"""
+        total_value = 0.0
+        total_weight = 0.0
+        for i in range(values.shape[0]):
+            total_value += values[i] * weights[i]
+            total_weight += weights[i]
+        return total_value, total_weight
+else:
+    def weighted_sum(values, weights):
+        """返回 (sum(values * weights), sum(weights))"""
+        return float(np.dot(values, weights)), float(weights.sum())
+
+
+def warm_up() -> None:
+    """预先触发JIT编译（或加载磁盘缓存），避免首个行情到来时编译"""
+    sample = np.ones(2)
+    weighted_sum(sample, sample)
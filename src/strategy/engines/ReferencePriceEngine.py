@@ -1,5 +1,14 @@
 from decimal import Decimal
+from collections import deque
 import time
+from types import MappingProxyType
+import numpy as np
+from . import PriceKernels
+from ...core.events.EventType import PriceUpdateEvent, EventType
+
+_ZERO = Decimal('0')
+# 价格更新事件不携带附加数据，所有事件共享同一个只读空映射
+_EMPTY_EVENT_DATA = MappingProxyType({})
 
 class ReferencePriceEngine:
     def __init__(self, config, event_bus=None):
@@ -12,28 +21,49 @@ class ReferencePriceEngine:
         self.twap_window = getattr(config, 'twap_window', 10)
         self.confidence_threshold = getattr(config, 'confidence_threshold', 0.95)
         self.max_price_deviation = getattr(config, 'max_price_deviation', 0.05)
-        self.prices = []
+        self.prices = deque(maxlen=self.twap_window)
+        self._price_sum = Decimal('0')  # 窗口内价格的滚动和
+        
+        # 预热价格计算内核
+        PriceKernels.warm_up()
 
     async def on_market_price(self, price: Decimal):
+        # 维护滚动和，窗口已满时减去将被挤出的价格
+        if len(self.prices) == self.prices.maxlen:
+            self._price_sum -= self.prices[0]
         self.prices.append(price)
-        if len(self.prices) > self.twap_window:
-            self.prices.pop(0)
+        self._price_sum += price
         # Emit PriceUpdateEvent if event_bus is set
         if self.event_bus is not None:
-            from src.core.events.EventType import PriceUpdateEvent, EventType
             event = PriceUpdateEvent(
                 event_type=EventType.PRICE_UPDATE,
                 timestamp=time.time(),
-                data={},
+                data=_EMPTY_EVENT_DATA,
                 reference_price=price,
-                price_change=Decimal('0'),
+                price_change=_ZERO,
                 confidence=self.confidence_threshold
             )
             await self.event_bus.publish(event)
 
+    @staticmethod
+    def _trade_arrays(market_data):
+        """取出市场数据中的交易数组 (prices, volumes, timestamps)，不支持时返回None"""
+        prices = getattr(market_data, 'trade_prices', None)
+        if not isinstance(prices, np.ndarray):
+            return None
+        count = market_data.trade_count
+        return prices[:count], market_data.trade_volumes[:count], market_data.trade_timestamps[:count]
+
     def _calculate_twap(self, market_data=None):
         # 支持传入market_data或用自身prices
         if market_data is not None:
+            arrays = self._trade_arrays(market_data)
+            if arrays is not None:
+                prices, _, timestamps = arrays
+                total_value, total_time = PriceKernels.weighted_sum(prices, timestamps)
+                if total_time == 0:
+                    return getattr(market_data, 'mid_price', Decimal('0'))
+                return Decimal(str(total_value / total_time))
             if not hasattr(market_data, 'recent_trades') or not market_data.recent_trades:
                 return getattr(market_data, 'mid_price', Decimal('0'))
             total_time = Decimal('0')
@@ -55,7 +85,7 @@ class ReferencePriceEngine:
         else:
             if not self.prices:
                 return Decimal('0')
-            return sum(self.prices) / Decimal(len(self.prices))
+            return self._price_sum / len(self.prices)
 
     async def calculate_reference_price(self, market_data) -> Decimal:
         # 混合算法：结合TWAP和VWAP
@@ -72,6 +102,13 @@ class ReferencePriceEngine:
 
     def _calculate_vwap(self, market_data):
         # 简单VWAP实现
+        arrays = self._trade_arrays(market_data)
+        if arrays is not None:
+            prices, volumes, _ = arrays
+            total_value, total_volume = PriceKernels.weighted_sum(prices, volumes)
+            if total_volume == 0:
+                return getattr(market_data, 'mid_price', Decimal('0'))
+            return Decimal(str(total_value / total_volume))
         if not hasattr(market_data, 'recent_trades') or not market_data.recent_trades:
             return getattr(market_data, 'mid_price', Decimal('0'))
         total_volume = sum(getattr(trade, 'volume', Decimal('0')) for trade in market_data.recent_trades)
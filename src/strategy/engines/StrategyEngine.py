@@ -1,8 +1,10 @@
-from decimal import Decimal
+from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING
 from typing import List
 from ...core.orders.OrderManager import OrderManager
 from ...core.orders.OrderAnalysis import OrderAnalysis
 from ...core.orders.OrderDecision import CancelOrderDecision, PlaceOrderDecision, OrderDecision, ModifyOrderDecision
+from .OrderClassifier import classify_orders
+from ...utils.pricing.PriceTicks import PRICE_TICK
 import random
 import logging
 
@@ -22,10 +24,16 @@ class StrategyEngine:
         self.modify_threshold = Decimal(str(config.modify_threshold))  # 0.003 (0.3%) - 改单阈值
         self.max_modify_deviation = Decimal(str(config.max_modify_deviation))  # 0.01 (1%) - 最大改单偏差
         
+        # 预先计算报价系数，避免每次价格更新重复Decimal运算
+        self._spread_scaled = self.max_spread * Decimal('0.8')
+        self._bid_factor = Decimal('1') - self._spread_scaled
+        self._ask_factor = Decimal('1') + self._spread_scaled
+        self._close_threshold = self.min_spread * Decimal('0.8')
+        
     async def on_price_update(self, price_event) -> None:
         """处理价格更新事件"""
         new_price = price_event.reference_price
-        self.logger.info(f"策略引擎收到价格更新: {new_price}")
+        self.logger.info("策略引擎收到价格更新: %s", new_price)
         
         # 1. 分析当前订单状态
         analysis = await self._analyze_current_orders(new_price)
@@ -33,70 +41,57 @@ class StrategyEngine:
         # 2. 生成订单调整决策（优先改单）
         decisions = await self._generate_order_decisions(analysis, new_price)
         
-        # 3. 发布决策事件
-        self.logger.info(f"策略引擎生成 {len(decisions)} 个决策")
-        for decision in decisions:
-            self.logger.info(f"发布决策: {type(decision).__name__}")
-            await self.event_bus.publish(decision)
+        # 3. 批量发布决策事件
+        self.logger.info("策略引擎生成 %d 个决策", len(decisions))
+        if self.logger.isEnabledFor(logging.INFO):
+            for decision in decisions:
+                self.logger.info("发布决策: %s", type(decision).__name__)
+        if decisions:
+            await self.event_bus.publish_many(decisions)
             
     async def _analyze_current_orders(self, reference_price: Decimal) -> OrderAnalysis:
         """分析当前订单状态"""
         active_orders = await self.order_manager.get_active_orders()
-        self.logger.info(f"当前活跃订单数: {len(active_orders)}")
+        self.logger.info("当前活跃订单数: %d", len(active_orders))
         
         analysis = OrderAnalysis()
+        orders_to_cancel, orders_to_modify, bid_count, ask_count = classify_orders(
+            active_orders, reference_price,
+            self.drift_threshold, self.max_modify_deviation,
+            self._close_threshold, self.modify_threshold
+        )
+        analysis.orders_to_cancel = orders_to_cancel
         
-        for order in active_orders:
-            # 计算价格偏差
-            price_deviation = abs(order.price - reference_price) / reference_price
-            
-            # 检查是否需要调整
-            if price_deviation > self.drift_threshold:
-                # 检查是否可以通过改单解决
-                if price_deviation <= self.max_modify_deviation:
-                    # 在改单范围内，尝试改单
-                    new_price = self._calculate_optimal_price(order.side, reference_price)
-                    analysis.orders_to_modify.append({
-                        'order_id': order.order_id,
-                        'new_price': new_price,
-                        'new_quantity': None  # 暂时不修改数量
-                    })
-                else:
-                    # 偏差太大，需要撤单
-                    analysis.orders_to_cancel.append(order.order_id)
-            elif price_deviation < (self.min_spread * Decimal('0.8')):  # 过于接近
-                # 检查是否可以通过改单调整
-                if price_deviation >= self.modify_threshold:
-                    new_price = self._calculate_optimal_price(order.side, reference_price)
-                    analysis.orders_to_modify.append({
-                        'order_id': order.order_id,
-                        'new_price': new_price,
-                        'new_quantity': None
-                    })
-                else:
-                    # 偏差太小，撤单
-                    analysis.orders_to_cancel.append(order.order_id)
+        # 同一方向的目标价格相同，每次分析只计算一次
+        if orders_to_modify:
+            bid_price = self._calculate_optimal_price('BUY', reference_price)
+            ask_price = self._calculate_optimal_price('SELL', reference_price)
+            for order in orders_to_modify:
+                analysis.orders_to_modify.append({
+                    'order_id': order.order_id,
+                    'new_price': bid_price if order.side == 'BUY' else ask_price,
+                    'new_quantity': None  # 暂时不修改数量
+                })
                 
         # 检查订单数量
-        bid_count = len([o for o in active_orders if o.side == 'BUY'])
-        ask_count = len([o for o in active_orders if o.side == 'SELL'])
-        
         analysis.need_bid_orders = max(0, self.target_orders_per_side - bid_count)
         analysis.need_ask_orders = max(0, self.target_orders_per_side - ask_count)
         
-        self.logger.info(f"分析结果: 需要买单 {analysis.need_bid_orders} 个, 需要卖单 {analysis.need_ask_orders} 个")
-        self.logger.info(f"需要改单: {len(analysis.orders_to_modify)} 个, 需要撤单: {len(analysis.orders_to_cancel)} 个")
+        self.logger.info("分析结果: 需要买单 %d 个, 需要卖单 %d 个",
+                         analysis.need_bid_orders, analysis.need_ask_orders)
+        self.logger.info("需要改单: %d 个, 需要撤单: %d 个",
+                         len(analysis.orders_to_modify), len(analysis.orders_to_cancel))
         
         return analysis
         
     def _calculate_optimal_price(self, side: str, reference_price: Decimal) -> Decimal:
-        """计算最优价格"""
+        """计算最优价格（对齐到最小价格单位，向远离参考价格的方向取整）"""
         if side == 'BUY':
             # 买单价格略低于参考价格
-            return reference_price * (Decimal('1') - self.max_spread * Decimal('0.8'))
+            return (reference_price * self._bid_factor).quantize(PRICE_TICK, rounding=ROUND_FLOOR)
         else:
             # 卖单价格略高于参考价格
-            return reference_price * (Decimal('1') + self.max_spread * Decimal('0.8'))
+            return (reference_price * self._ask_factor).quantize(PRICE_TICK, rounding=ROUND_CEILING)
         
     async def _generate_order_decisions(self, analysis: OrderAnalysis, 
                                       reference_price: Decimal) -> List['OrderDecision']:
@@ -118,7 +113,7 @@ class StrategyEngine:
         # 3. 发单决策 - 优化订单位置以降低成交风险
         if analysis.need_bid_orders > 0:
             # 买单放置在区间较低位置，降低成交风险
-            optimal_bid_price = reference_price * (Decimal('1') - self.max_spread * Decimal('0.8'))
+            optimal_bid_price = self._calculate_optimal_price('BUY', reference_price)
             quantity = self._calculate_order_quantity(optimal_bid_price)
             
             decisions.append(PlaceOrderDecision(
@@ -129,7 +124,7 @@ class StrategyEngine:
             
         if analysis.need_ask_orders > 0:
             # 卖单放置在区间较高位置，降低成交风险
-            optimal_ask_price = reference_price * (Decimal('1') + self.max_spread * Decimal('0.8'))
+            optimal_ask_price = self._calculate_optimal_price('SELL', reference_price)
             quantity = self._calculate_order_quantity(optimal_ask_price)
             
             decisions.append(PlaceOrderDecision(
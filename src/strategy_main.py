@@ -2,26 +2,33 @@ import asyncio
 import signal
 import sys
 from pathlib import Path
-from config.loaders.ConfigLoader import ConfigLoader
-from core.events.EventBus import EventBus
-from market.data.MarketDataGateway import MarketDataGateway
-from strategy.engines.ReferencePriceEngine import ReferencePriceEngine
-from core.orders.OrderState import OrderManager
-from strategy.engines.StrategyEngine import StrategyEngine
-from execution.ExecutionEngine import ExecutionEngine
-from risk.management.RiskManager import RiskManager
-from core.events.EventType import SystemStartEvent, SystemStopEvent
 import time
 
+# 组件模块在使用处导入，避免导入本模块时加载整个依赖树
+
 class MarketMakingStrategy:
     def __init__(self, config_path: str):
+        from config.loaders.ConfigLoader import ConfigLoader
+        from core.events.EventBus import EventBus
+        
         self.config = ConfigLoader.load_from_file(config_path)
         self.event_bus = EventBus()
         self.components = {}
+        self._start_groups = []
+        self._stop_groups = []
         self.running = False
+        self._stop_task = None
+        self._stop_evt = asyncio.Event()
         
     async def initialize(self) -> None:
         """初始化所有组件"""
+        from market.data.MarketDataGateway import MarketDataGateway
+        from strategy.engines.ReferencePriceEngine import ReferencePriceEngine
+        from core.orders.OrderManager import OrderManager
+        from strategy.engines.StrategyEngine import StrategyEngine
+        from execution.ExecutionEngine import ExecutionEngine
+        from risk.management.RiskManager import RiskManager
+        
         # 创建组件
         self.components['market_gateway'] = MarketDataGateway(
             self.config, self.event_bus
@@ -45,46 +52,67 @@ class MarketMakingStrategy:
             self.config.risk, self.event_bus
         )
         
+        # 生命周期方法只检查一次，按组启停：组内并发，组间有序。
+        # 行情网关最后启动、最先停止，确保行情到来前其他组件已完成订阅
+        ingress = [self.components['market_gateway']]
+        core = [c for c in self.components.values() if c not in ingress]
+        self._start_groups = [
+            [c for c in core if hasattr(c, 'start')],
+            [c for c in ingress if hasattr(c, 'start')]
+        ]
+        self._stop_groups = [
+            [c for c in ingress if hasattr(c, 'stop')],
+            [c for c in core if hasattr(c, 'stop')]
+        ]
+        
         # 启动事件总线
         await self.event_bus.start()
         
         # 启动所有组件
-        for component in self.components.values():
-            if hasattr(component, 'start'):
-                await component.start()
+        for group in self._start_groups:
+            await asyncio.gather(*(component.start() for component in group))
                 
     async def start(self) -> None:
         """启动策略"""
         self.running = True
         
+        from core.events.EventType import BaseEvent, EventType
+        
         # 发布启动事件
-        await self.event_bus.publish(SystemStartEvent(
+        await self.event_bus.publish(BaseEvent(
+            event_type=EventType.SYSTEM_START,
             timestamp=time.time(),
             data={'config': self.config}
         ))
         
         print(f"Market Making Strategy started for {self.config.strategy.symbol}")
         
-        # 保持运行
-        while self.running:
-            await asyncio.sleep(1)
+        # 保持运行，直到stop()设置停止事件
+        await self._stop_evt.wait()
             
     async def stop(self) -> None:
         """停止策略"""
         self.running = False
+        self._stop_evt.set()
         
         print("Shutting down Market Making Strategy...")
         
+        from core.events.EventType import BaseEvent, EventType
+        
         # 发布停止事件
-        await self.event_bus.publish(SystemStopEvent(
+        await self.event_bus.publish(BaseEvent(
+            event_type=EventType.SYSTEM_STOP,
             timestamp=time.time(),
             data={'reason': 'manual_shutdown'}
         ))
         
-        # 停止所有组件
-        for component in self.components.values():
-            if hasattr(component, 'stop'):
-                await component.stop()
+        # 停止所有组件（单个组件停止失败不影响其他组件）
+        for group in self._stop_groups:
+            results = await asyncio.gather(*(component.stop() for component in group),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Component stop error: {result}")
                 
         # 停止事件总线
         await self.event_bus.stop()
@@ -92,13 +120,20 @@ class MarketMakingStrategy:
         print("Market Making Strategy stopped")
         
     def setup_signal_handlers(self) -> None:
-        """设置信号处理器"""
-        def signal_handler(signum, frame):
+        """设置信号处理器（需在事件循环运行时调用）"""
+        loop = asyncio.get_running_loop()
+        
+        def request_stop(signum):
             print(f"Received signal {signum}, shutting down...")
-            asyncio.create_task(self.stop())
+            # 保存任务引用，避免停止任务被垃圾回收
+            self._stop_task = loop.create_task(self.stop())
             
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, request_stop, signum)
+            except NotImplementedError:
+                # Windows事件循环不支持add_signal_handler，回退到signal.signal并切回事件循环线程
+                signal.signal(signum, lambda s, frame: loop.call_soon_threadsafe(request_stop, s))
 
 async def main():
     """主函数"""
@@ -110,6 +145,9 @@ async def main():
     try:
         await strategy.initialize()
         await strategy.start()
+        # 停止事件在stop()开始时设置，等待关闭流程完成后再退出事件循环
+        if strategy._stop_task is not None:
+            await strategy._stop_task
     except KeyboardInterrupt:
         await strategy.stop()
     except Exception as e:
@@ -117,5 +155,20 @@ async def main():
         await strategy.stop()
         sys.exit(1)
 
+def run() -> None:
+    """运行主函数，uvloop可用时使用uvloop事件循环"""
+    try:
+        import uvloop
+    except ImportError:  # uvloop为可选依赖（不支持Windows），缺失时使用默认事件循环
+        uvloop = None
+        
+    if uvloop is None:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 12):
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+    else:
+        uvloop.install()
+        asyncio.run(main())
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -1,42 +1,59 @@
 import asyncio
-import time
-from collections import deque
+from fractions import Fraction
+from time import monotonic_ns
+from typing import Awaitable, Callable, Union
+
+# 令牌以纳秒精度的整数计量：整数速率时1个令牌 = 1_000_000_000 个单位
+_NS_PER_SECOND = 1_000_000_000
 
 class RateLimiter:
-    """速率限制器"""
-    
-    def __init__(self, max_requests_per_second: int):
+    """速率限制器（令牌桶）"""
+
+    # 状态固定为几个标量，不随请求数量增长
+    __slots__ = ('max_requests', 'enabled', '_rate', '_token', '_capacity', '_tokens', '_last', '_now', '_sleep')
+
+    def __init__(self, max_requests_per_second: Union[int, float, str],
+                 time_fn: Callable[[], int] = monotonic_ns,
+                 sleep_fn: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        """速率可为小数（如0.5或2.5次/秒），按精确分数计算；time_fn返回单调时钟的整数纳秒，
+        sleep_fn为等待函数，测试中可注入可控时钟和等待函数"""
+        self._now = time_fn
+        self._sleep = sleep_fn
         self.max_requests = max_requests_per_second
-        self.request_times = deque()
-        self._lock = asyncio.Lock()
-        
+        # float按十进制字面值转换为分数，避免二进制误差
+        rate = Fraction(str(max_requests_per_second)) if isinstance(max_requests_per_second, float) \
+            else Fraction(max_requests_per_second)
+        self.enabled = rate > 0  # 非正数表示不限速
+        # 令牌以整数计量：1个令牌 = 分母 × 1e9 个单位，每纳秒补充 分子 个单位，整数速率时与按纳秒计量一致
+        self._rate = rate.numerator
+        self._token = rate.denominator * _NS_PER_SECOND
+        # 桶容量为1秒的请求数，至少容纳1个令牌
+        self._capacity = max(rate.numerator, rate.denominator) * _NS_PER_SECOND
+        self._tokens = self._capacity
+        self._last = time_fn()
+
+    def _refill(self) -> None:
+        """按经过时间补充令牌，最多补满桶容量（整数运算）"""
+        now = self._now()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
     async def acquire(self) -> None:
         """获取请求许可"""
-        async with self._lock:
-            if self.max_requests <= 0:
-                return
-            current_time = time.time()
-            
-            # 清理超过1秒的请求记录
-            while self.request_times and current_time - self.request_times[0] >= 1.0:
-                self.request_times.popleft()
-                
-            # 如果当前1秒内的请求数已达到限制，等待
-            if len(self.request_times) >= self.max_requests:
-                wait_time = 1.0 - (current_time - self.request_times[0])
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    current_time = time.time()
-                    
-            # 记录当前请求时间
-            self.request_times.append(current_time)
-            
+        if not self.enabled:
+            return
+        # 补充令牌（内联并使用局部变量），令牌在等待前预先扣除，并发请求按顺序排队，无需加锁
+        now = self._now()
+        rate = self._rate
+        tokens = min(self._capacity, self._tokens + (now - self._last) * rate) - self._token
+        self._tokens = tokens
+        self._last = now
+        if tokens < 0:
+            await self._sleep(-(tokens // rate) / _NS_PER_SECOND)
+
     def get_current_rate(self) -> float:
-        """获取当前请求速率"""
-        current_time = time.time()
-        
-        # 清理过期的请求记录
-        while self.request_times and current_time - self.request_times[0] >= 1.0:
-            self.request_times.popleft()
-            
-        return len(self.request_times) 
\ No newline at end of file
+        """获取当前请求速率（最近一秒内消耗的令牌数）"""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        return max(0, self._capacity - self._tokens) / self._token
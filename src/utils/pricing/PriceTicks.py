@@ -0,0 +1,32 @@
+from decimal import Decimal
+from typing import Optional, Union
+
+# 价格定点精度：1 tick = 1e-8，覆盖Binance所有交易对的最小价格精度
+PRICE_SCALE = 10 ** 8
+_DECIMAL_SCALE = Decimal(PRICE_SCALE)
+# 最小价格单位（1 tick）
+PRICE_TICK = Decimal(1).scaleb(-8)
+
+def to_ticks(price: Union[str, float, Decimal], rounding: Optional[str] = None) -> int:
+    """将价格转换为整数tick（价格 × PRICE_SCALE），rounding仅对Decimal生效，如ROUND_FLOOR"""
+    if isinstance(price, Decimal):
+        return int((price * _DECIMAL_SCALE).to_integral_value(rounding=rounding))
+    # 1e6以内的价格乘以1e8仍在float53位精度内，四舍五入即可得到精确tick
+    return round(float(price) * PRICE_SCALE)
+
+def to_ticks_exact(price: Union[str, float, Decimal]) -> int:
+    """将价格精确转换为整数tick，价格精度细于1 tick时抛出ValueError而不是舍入"""
+    if isinstance(price, float):
+        # float按最短十进制表示转换（0.1 -> Decimal('0.1')），不按其二进制展开判断精度
+        price = Decimal(repr(price))
+    elif not isinstance(price, Decimal):
+        price = Decimal(price)
+    scaled = price.scaleb(8)
+    ticks = int(scaled)
+    if ticks != scaled:
+        raise ValueError(f"价格精度超过1e-8: {price}")
+    return ticks
+
+def ticks_to_decimal(ticks: int) -> Decimal:
+    """将整数tick转换回Decimal价格（仅在REST/事件边界使用）"""
+    return Decimal(ticks) / _DECIMAL_SCALE
@@ -0,0 +1,14 @@
+"""
+价格定点表示
+Fixed-point price utilities
+"""
+
+from .PriceTicks import PRICE_SCALE, PRICE_TICK, to_ticks, to_ticks_exact, ticks_to_decimal
+
+__all__ = [
+    'PRICE_SCALE',
+    'PRICE_TICK',
+    'to_ticks',
+    'to_ticks_exact',
+    'ticks_to_decimal'
+]
@@ -0,0 +1,70 @@
+import pytest
+import pytest_asyncio
+import asyncio
+from decimal import Decimal
+from src.core.events.EventBus import EventBus
+from src.risk.management.RiskConfig import RiskConfig
+
+try:
+    import uvloop
+except ImportError:  # uvloop为可选依赖（不支持Windows），缺失时使用默认事件循环
+    uvloop = None
+
+if uvloop is not None:
+    # 旧版pytest-asyncio没有该钩子，标记为可选钩子时不会报错，测试使用默认事件循环
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """测试使用uvloop事件循环"""
+        return {'uvloop': uvloop.new_event_loop}
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_event_bus():
+    """创建整个测试会话共享的事件总线实例，只启动和停止一次"""
+    bus = EventBus()
+    await bus.start()
+    yield bus
+    await bus.stop()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def event_bus(shared_event_bus):
+    """每个测试前等待队列排空，并清空订阅和统计"""
+    await asyncio.wait_for(shared_event_bus.event_queue.join(), timeout=1.0)
+    shared_event_bus.clear_subscribers()
+    shared_event_bus.stats.reset()
+    return shared_event_bus
+
+class RecordingBus:
+    """轻量事件总线替身，按顺序记录发布的事件"""
+    
+    def __init__(self):
+        self.published = []
+    
+    def publish(self, event):
+        """调用时即同步记录事件，返回可等待对象以兼容异步调用方"""
+        self.published.append(event)
+        return asyncio.sleep(0)
+    
+    async def publish_many(self, events):
+        """批量记录事件"""
+        self.published.extend(events)
+    
+    def publish_nowait(self, event):
+        """非阻塞发布，总是成功"""
+        self.published.append(event)
+        return True
+
+@pytest.fixture
+def recording_bus():
+    """创建记录发布事件的事件总线替身"""
+    return RecordingBus()
+
+@pytest.fixture(scope="module")
+def risk_config():
+    """创建模块内共享的风险配置（测试中不得修改）"""
+    return RiskConfig(
+        max_position=Decimal("1.0"),
+        max_order_count=100,
+        max_daily_loss=Decimal("1000"),
+        max_price_change=Decimal("0.1"),  # 10%
+        check_interval=5
+    )
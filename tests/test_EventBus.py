@@ -1,32 +1,27 @@
 import pytest
-import pytest_asyncio
 import asyncio
 from src.core.events.EventBus import EventBus, EventBusStats
-from src.core.events.EventType import EventType, PriceUpdateEvent
+from src.core.events.EventType import EventType, PriceUpdateEvent, BaseEvent
 from decimal import Decimal
 
+# 模块内所有协程测试共用会话级事件循环（与共享事件总线一致）
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
 class TestEventBus:
-    @pytest_asyncio.fixture
-    async def event_bus(self):
-        """创建事件总线实例"""
-        bus = EventBus()
-        await bus.start()
-        yield bus
-        await bus.stop()
-        
-    @pytest.mark.asyncio
+
     async def test_event_bus_creation(self, event_bus):
         """测试事件总线创建"""
         assert event_bus is not None
         assert isinstance(event_bus.stats, EventBusStats)
         
-    @pytest.mark.asyncio
     async def test_event_publishing(self, event_bus):
         """测试事件发布"""
         events_received = []
+        done = asyncio.Event()
         
         async def test_handler(event):
             events_received.append(event)
+            done.set()
             
         # 订阅事件
         await event_bus.subscribe(EventType.PRICE_UPDATE, test_handler)
@@ -44,22 +39,25 @@ class TestEventBus:
         await event_bus.publish(test_event)
         
         # 等待事件处理
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(done.wait(), timeout=1.0)
         
         assert len(events_received) == 1
         assert events_received[0].data['test'] == 'data'
         
-    @pytest.mark.asyncio
     async def test_multiple_subscribers(self, event_bus):
         """测试多个订阅者"""
         handler1_events = []
         handler2_events = []
+        done1 = asyncio.Event()
+        done2 = asyncio.Event()
         
         async def handler1(event):
             handler1_events.append(event)
+            done1.set()
             
         async def handler2(event):
             handler2_events.append(event)
+            done2.set()
             
         # 订阅事件
         await event_bus.subscribe(EventType.PRICE_UPDATE, handler1)
@@ -78,12 +76,11 @@ class TestEventBus:
         await event_bus.publish(test_event)
         
         # 等待事件处理
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(asyncio.gather(done1.wait(), done2.wait()), timeout=1.0)
         
         assert len(handler1_events) == 1
         assert len(handler2_events) == 1
         
-    @pytest.mark.asyncio
     async def test_event_stats(self, event_bus):
         """测试事件统计"""
         async def test_handler(event):
@@ -103,9 +100,118 @@ class TestEventBus:
             )
             await event_bus.publish(test_event)
             
-        # 等待事件处理
-        await asyncio.sleep(0.1)
+        # 等待队列中的事件全部处理完成
+        await asyncio.wait_for(event_bus.event_queue.join(), timeout=1.0)
         
         assert event_bus.stats.events_published == 5
         assert event_bus.stats.events_processed == 5
-        assert event_bus.stats.avg_processing_time >= 0 
\ No newline at end of file
+        assert event_bus.stats.avg_processing_time >= 0 
+        
+    async def test_slow_subscriber_does_not_block_others(self, event_bus):
+        """测试同一事件的慢订阅者不阻塞快订阅者"""
+        release = asyncio.Event()
+        fast_done = asyncio.Event()
+        slow_done = asyncio.Event()
+        
+        async def slow_handler(event):
+            await release.wait()
+            slow_done.set()
+            
+        async def fast_handler(event):
+            fast_done.set()
+            
+        # 慢订阅者先订阅
+        await event_bus.subscribe(EventType.PRICE_UPDATE, slow_handler)
+        await event_bus.subscribe(EventType.PRICE_UPDATE, fast_handler)
+        
+        await event_bus.publish(PriceUpdateEvent(
+            event_type=EventType.PRICE_UPDATE,
+            timestamp=1234567890,
+            data={},
+            reference_price=Decimal('100'),
+            price_change=Decimal('0.01'),
+            confidence=0.99
+        ))
+        
+        # 慢订阅者仍在等待时，快订阅者已完成
+        await asyncio.wait_for(fast_done.wait(), timeout=1.0)
+        assert not slow_done.is_set()
+        
+        release.set()
+        await asyncio.wait_for(slow_done.wait(), timeout=1.0)
+        
+    async def test_publish_nowait_bounded_queue(self):
+        """测试非阻塞发布在队列满时丢弃事件"""
+        bus = EventBus(max_queue_size=2)
+        results = []
+        for i in range(3):
+            results.append(bus.publish_nowait(PriceUpdateEvent(
+                event_type=EventType.PRICE_UPDATE,
+                timestamp=1234567890 + i,
+                data={'index': i},
+                reference_price=Decimal('100'),
+                price_change=Decimal('0.01'),
+                confidence=0.99
+            )))
+        
+        assert results == [True, True, False]
+        assert bus.stats.events_published == 2
+        assert bus.stats.events_dropped == 1
+        assert bus.event_queue.qsize() == 2
+        
+    async def test_publish_many(self, event_bus):
+        """测试批量发布事件"""
+        events_received = []
+        done = asyncio.Event()
+        
+        async def test_handler(event):
+            events_received.append(event)
+            if len(events_received) == 3:
+                done.set()
+            
+        await event_bus.subscribe(EventType.PRICE_UPDATE, test_handler)
+        
+        await event_bus.publish_many([
+            PriceUpdateEvent(
+                event_type=EventType.PRICE_UPDATE,
+                timestamp=1234567890 + i,
+                data={'index': i},
+                reference_price=Decimal('100'),
+                price_change=Decimal('0.01'),
+                confidence=0.99
+            )
+            for i in range(3)
+        ])
+        
+        await asyncio.wait_for(done.wait(), timeout=1.0)
+        
+        assert event_bus.stats.events_published == 3
+        assert sorted(e.data['index'] for e in events_received) == [0, 1, 2]
+        
+    async def test_publish_base_event(self, event_bus):
+        """测试发布没有correlation_id字段的基础事件"""
+        events_received = []
+        done = asyncio.Event()
+        
+        async def test_handler(event):
+            events_received.append(event)
+            if len(events_received) == 2:
+                done.set()
+            
+        await event_bus.subscribe(EventType.MARKET_TRADE, test_handler)
+        
+        await event_bus.publish(BaseEvent(
+            event_type=EventType.MARKET_TRADE,
+            timestamp=1234567890,
+            data={'price': 100.0}
+        ))
+        event_bus.publish_nowait(BaseEvent(
+            event_type=EventType.MARKET_TRADE,
+            timestamp=1234567891,
+            data={'price': 101.0}
+        ))
+        
+        await asyncio.wait_for(done.wait(), timeout=1.0)
+        
+        assert len(events_received) == 2
+        assert all(e.correlation_id for e in events_received)
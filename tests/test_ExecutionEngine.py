@@ -0,0 +1,96 @@
+import pytest
+import pytest_asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from src.execution.ExecutionEngine import ExecutionEngine
+from src.execution.ExecutionTask import ExecutionTask
+from src.core.orders.OrderManager import OrderManager
+from src.core.orders.OrderState import OrderState, OrderStatus
+from src.core.events.EventType import PlaceOrderEvent, EventType
+from src.config.Configs import ExecutionConfig
+
+# 模块内所有协程测试统一标记为asyncio测试
+pytestmark = pytest.mark.asyncio
+
+# 固定的测试时间戳（测试不依赖真实时钟）
+T0 = 1_700_000_000.0
+
+EXECUTION_CONFIG = ExecutionConfig(
+    symbol="BTCUSDT",
+    worker_count=1,
+    batch_size=10,
+    rate_limit=0,  # 不限速
+    max_retries=0,
+    retry_delay=0.0,
+    modify_worker_count=1,
+    modify_rate_limit=0,
+    request_timeout=1.0
+)
+
+@pytest_asyncio.fixture
+async def order_manager(recording_bus):
+    manager = OrderManager(recording_bus)
+    yield manager
+    await manager.stop()
+
+@pytest.fixture
+def engine(recording_bus, order_manager):
+    """创建执行引擎，交易所下单接口替换为模拟"""
+    execution_engine = ExecutionEngine(EXECUTION_CONFIG, recording_bus, order_manager)
+    execution_engine.exchange_api.place_order = AsyncMock(return_value={'orderId': 'exchange_1'})
+    return execution_engine
+
+async def test_place_order_path(engine, order_manager):
+    """测试下单事件经执行任务下单，并以交易所订单ID激活订单"""
+    await engine.handle_place_order(PlaceOrderEvent(
+        event_type=EventType.PLACE_ORDER,
+        timestamp=T0,
+        data={},
+        side='BUY',
+        price=Decimal('50000.5'),
+        quantity=Decimal('0.1')
+    ))
+    
+    # 执行任务入队时订单已写入订单管理器
+    task = engine.execution_queue.get_nowait()
+    client_order_id = task.order_data.client_order_id
+    assert order_manager.get_order_by_id_sync(client_order_id) is task.order_data
+    
+    await engine._execute_task(task, "worker-0")
+    
+    engine.exchange_api.place_order.assert_awaited_once_with(
+        symbol="BTCUSDT",
+        side='BUY',
+        type='LIMIT',
+        quantity='0.1',
+        price='50000.5',
+        timeInForce='GTC',
+        newClientOrderId=client_order_id
+    )
+    order = order_manager.get_order_by_id_sync('exchange_1')
+    assert order is task.order_data
+    assert order.status == OrderStatus.ACTIVE
+
+async def test_place_order_built_elsewhere(engine, order_manager):
+    """测试未经handle_place_order创建的订单也能下单（价格和数量字符串按需格式化）"""
+    order = OrderState(
+        order_id="",
+        client_order_id="client_rebuilt",
+        symbol="BTCUSDT",
+        side='SELL',
+        price=Decimal('51000'),
+        original_quantity=Decimal('0.25'),
+        executed_quantity=Decimal('0'),
+        status=OrderStatus.PENDING_NEW,
+        create_time=T0,
+        update_time=T0,
+        last_event_time=T0
+    )
+    order_manager.submit_order(order)
+    
+    await engine._execute_task(ExecutionTask(task_type='PLACE_ORDER', order_data=order), "worker-0")
+    
+    call = engine.exchange_api.place_order.await_args
+    assert call.kwargs['quantity'] == '0.25'
+    assert call.kwargs['price'] == '51000'
+    assert order.status == OrderStatus.ACTIVE
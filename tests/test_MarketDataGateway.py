@@ -0,0 +1,153 @@
+import pytest
+import asyncio
+from types import SimpleNamespace
+from src.market.data.MarketDataGateway import MarketDataGateway, DEPTH_COALESCE_INTERVAL
+from src.core.events.EventType import EventType
+
+# 模块内所有协程测试统一标记为asyncio测试
+pytestmark = pytest.mark.asyncio
+
+class FakeTimer:
+    """假定时器句柄"""
+    
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+    
+    def cancel(self):
+        self.cancelled = True
+
+class FakeLoop:
+    """可手动推进时间的事件循环替身，只提供time和call_later"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.timers = []
+    
+    def time(self):
+        return self.now
+    
+    def call_later(self, delay, callback):
+        timer = FakeTimer(self.now + delay, callback)
+        self.timers.append(timer)
+        return timer
+    
+    def advance(self, seconds):
+        """推进时间并执行到期的定时器"""
+        self.now += seconds
+        due = [t for t in self.timers if t.when <= self.now and not t.cancelled]
+        self.timers = [t for t in self.timers if t not in due and not t.cancelled]
+        for timer in due:
+            timer.callback()
+
+def depth_frame(bid, ask, qty="1"):
+    """构造深度消息"""
+    return {'e': 'depthUpdate', 'b': [[bid, qty]], 'a': [[ask, qty]]}
+
+@pytest.fixture
+def gateway(recording_bus):
+    """创建未连接WebSocket的行情网关"""
+    config = SimpleNamespace(strategy=SimpleNamespace(symbol="BTCUSDT"))
+    return MarketDataGateway(config, recording_bus)
+
+class TestMessageQueue:
+    """测试接收消息队列"""
+    
+    async def test_enqueue_within_capacity(self, gateway):
+        """测试队列未满时按顺序入队"""
+        gateway._in_queue = asyncio.Queue(maxsize=3)
+        for message in ('a', 'b', 'c'):
+            gateway._enqueue_message(message)
+        
+        assert [gateway._in_queue.get_nowait() for _ in range(3)] == ['a', 'b', 'c']
+        assert gateway.messages_dropped == 0
+        
+    async def test_enqueue_overflow_drops_oldest(self, gateway):
+        """测试队列满时丢弃最旧的消息并计数"""
+        gateway._in_queue = asyncio.Queue(maxsize=2)
+        for message in ('a', 'b', 'c'):
+            gateway._enqueue_message(message)
+        
+        assert gateway._in_queue.qsize() == 2
+        assert [gateway._in_queue.get_nowait() for _ in range(2)] == ['b', 'c']
+        assert gateway.messages_dropped == 1
+        
+    async def test_enqueue_repeated_overflow_keeps_latest_in_order(self, gateway):
+        """测试持续溢出时保留最新消息且顺序不变"""
+        gateway._in_queue = asyncio.Queue(maxsize=3)
+        for i in range(10):
+            gateway._enqueue_message(i)
+        
+        assert [gateway._in_queue.get_nowait() for _ in range(3)] == [7, 8, 9]
+        assert gateway.messages_dropped == 7
+
+class TestDepthCoalescing:
+    """测试深度事件合并发布"""
+    
+    @pytest.fixture
+    def loop(self, gateway):
+        """为网关注入假事件循环"""
+        fake_loop = FakeLoop()
+        gateway._loop = fake_loop
+        return fake_loop
+    
+    @staticmethod
+    def published_depth(gateway):
+        """返回已发布的深度快照（卖一数量）"""
+        return [e.data['asks'][0][1] for e in gateway.event_bus.published
+                if e.event_type == EventType.MARKET_DEPTH]
+    
+    async def test_first_frame_published(self, gateway, loop):
+        """测试首个深度帧立即发布"""
+        await gateway._process_depth(depth_frame("100", "101", "1"))
+        
+        assert self.published_depth(gateway) == [1.0]
+        assert loop.timers == []
+        
+    async def test_burst_coalesced_and_final_frame_flushed(self, gateway, loop):
+        """测试最优价不变的突发帧被合并，间隔结束时发布最后一帧"""
+        await gateway._process_depth(depth_frame("100", "101", "1"))
+        for qty in ("2", "3", "4"):
+            loop.advance(0.01)
+            await gateway._process_depth(depth_frame("100", "101", qty))
+        
+        # 合并期间只发布首帧，且只安排一次补发
+        assert self.published_depth(gateway) == [1.0]
+        assert len(loop.timers) == 1
+        
+        # 间隔结束时发布突发中的最后一帧
+        loop.advance(DEPTH_COALESCE_INTERVAL)
+        assert self.published_depth(gateway) == [1.0, 4.0]
+        assert gateway._pending_depth is None
+        
+    async def test_no_flush_without_new_frames(self, gateway, loop):
+        """测试间隔内没有新帧时不会补发"""
+        await gateway._process_depth(depth_frame("100", "101", "1"))
+        loop.advance(DEPTH_COALESCE_INTERVAL * 10)
+        
+        assert self.published_depth(gateway) == [1.0]
+        assert loop.timers == []
+        
+    async def test_best_price_change_published_immediately(self, gateway, loop):
+        """测试最优价变化时立即发布并取消待补发"""
+        await gateway._process_depth(depth_frame("100", "101", "1"))
+        loop.advance(0.01)
+        await gateway._process_depth(depth_frame("100", "101", "2"))
+        loop.advance(0.01)
+        await gateway._process_depth(depth_frame("100.5", "101", "3"))
+        
+        assert self.published_depth(gateway) == [1.0, 3.0]
+        
+        # 已发布的新帧取代暂存快照，间隔结束时不再补发旧帧
+        loop.advance(DEPTH_COALESCE_INTERVAL)
+        assert self.published_depth(gateway) == [1.0, 3.0]
+        
+    async def test_frame_after_interval_published(self, gateway, loop):
+        """测试距上次发布超过合并间隔的帧直接发布"""
+        await gateway._process_depth(depth_frame("100", "101", "1"))
+        loop.advance(DEPTH_COALESCE_INTERVAL + 0.001)
+        await gateway._process_depth(depth_frame("100", "101", "2"))
+        
+        assert self.published_depth(gateway) == [1.0, 2.0]
+        assert loop.timers == []
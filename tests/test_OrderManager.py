@@ -1,24 +1,25 @@
 import pytest
 import pytest_asyncio
 import asyncio
-from src.core.orders.OrderState import OrderManager, OrderState, OrderStatus
+from src.core.orders.OrderManager import OrderManager
+from src.core.orders.OrderState import OrderState, OrderStatus
 from src.core.events.EventBus import EventBus
+from src.utils.pricing import PRICE_SCALE
 from decimal import Decimal
-import time
 from unittest.mock import Mock, AsyncMock
 
-@pytest_asyncio.fixture
-async def event_bus():
-    bus = EventBus()
-    await bus.start()
-    yield bus
-    await bus.stop()
+# 模块内所有协程测试共用会话级事件循环（与共享事件总线一致）
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-@pytest_asyncio.fixture
+# 固定的测试时间戳（测试不依赖真实时钟）
+T0 = 1_700_000_000.0
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def order_manager(event_bus):
-    return OrderManager(event_bus)
+    manager = OrderManager(event_bus)
+    yield manager
+    await manager.stop()
 
-@pytest.mark.asyncio
 async def test_add_and_get_order(order_manager):
     order = OrderState(
         order_id="1",
@@ -29,16 +30,15 @@ async def test_add_and_get_order(order_manager):
         original_quantity=Decimal('1'),
         executed_quantity=Decimal('0'),
         status=OrderStatus.PENDING_NEW,
-        create_time=time.time(),
-        update_time=time.time(),
-        last_event_time=time.time()
+        create_time=T0,
+        update_time=T0,
+        last_event_time=T0
     )
     await order_manager.add_order(order)
     result = await order_manager.get_order_by_id("1")
     assert result.order_id == "1"
     assert result.status == OrderStatus.PENDING_NEW
 
-@pytest.mark.asyncio
 async def test_update_order_status(order_manager):
     order = OrderState(
         order_id="2",
@@ -49,9 +49,9 @@ async def test_update_order_status(order_manager):
         original_quantity=Decimal('2'),
         executed_quantity=Decimal('0'),
         status=OrderStatus.PENDING_NEW,
-        create_time=time.time(),
-        update_time=time.time(),
-        last_event_time=time.time()
+        create_time=T0,
+        update_time=T0,
+        last_event_time=T0
     )
     await order_manager.add_order(order)
     await order_manager.update_order_status("2", OrderStatus.ACTIVE, executed_qty=Decimal('1'))
@@ -59,7 +59,6 @@ async def test_update_order_status(order_manager):
     assert result.status == OrderStatus.ACTIVE
     assert result.executed_quantity == Decimal('1')
 
-@pytest.mark.asyncio
 async def test_get_active_orders(order_manager):
     order1 = OrderState(
         order_id="3",
@@ -70,9 +69,9 @@ async def test_get_active_orders(order_manager):
         original_quantity=Decimal('3'),
         executed_quantity=Decimal('0'),
         status=OrderStatus.ACTIVE,
-        create_time=time.time(),
-        update_time=time.time(),
-        last_event_time=time.time()
+        create_time=T0,
+        update_time=T0,
+        last_event_time=T0
     )
     order2 = OrderState(
         order_id="4",
@@ -83,9 +82,9 @@ async def test_get_active_orders(order_manager):
         original_quantity=Decimal('4'),
         executed_quantity=Decimal('0'),
         status=OrderStatus.FILLED,
-        create_time=time.time(),
-        update_time=time.time(),
-        last_event_time=time.time()
+        create_time=T0,
+        update_time=T0,
+        last_event_time=T0
     )
     await order_manager.add_order(order1)
     await order_manager.add_order(order2)
@@ -110,10 +109,10 @@ def sample_order():
         last_event_time=1234567890.0
     )
 
-@pytest.mark.asyncio
-async def test_add_order(order_manager, sample_order):
+async def test_add_order(order_manager, sample_order, monkeypatch):
     """测试添加订单"""
-    order_manager.event_bus.publish = AsyncMock()
+    # 事件总线在模块内共享，使用monkeypatch在测试结束后恢复
+    monkeypatch.setattr(order_manager.event_bus, 'publish', AsyncMock())
     await order_manager.add_order(sample_order)
     
     # 检查订单是否被添加
@@ -129,7 +128,6 @@ async def test_add_order(order_manager, sample_order):
     # 检查事件发布
     order_manager.event_bus.publish.assert_called_once()
     
-@pytest.mark.asyncio
 async def test_update_order_with_executed_quantity(order_manager, sample_order):
     """测试更新订单执行数量"""
     await order_manager.add_order(sample_order)
@@ -146,7 +144,6 @@ async def test_update_order_with_executed_quantity(order_manager, sample_order):
     assert updated_order.executed_quantity == Decimal("0.05")
     assert updated_order.remaining_quantity == Decimal("0.05")
     
-@pytest.mark.asyncio
 async def test_get_orders_by_price_range(order_manager):
     """测试按价格范围获取订单"""
     # 创建不同价格的订单
@@ -188,7 +185,39 @@ async def test_get_orders_by_price_range(order_manager):
     assert len(orders) == 1
     assert orders[0].order_id == "order1"
     
-@pytest.mark.asyncio
+async def test_price_index_maintenance(order_manager):
+    """测试价格索引随改单和归档更新"""
+    for order_id, price in (("a", "50000"), ("b", "50000"), ("c", "51000")):
+        await order_manager.add_order(OrderState(
+            order_id=order_id,
+            client_order_id="client_" + order_id,
+            symbol="BTCUSDT",
+            side="BUY",
+            price=Decimal(price),
+            original_quantity=Decimal("0.1"),
+            executed_quantity=Decimal("0"),
+            status=OrderStatus.ACTIVE,
+            create_time=1234567890.0,
+            update_time=1234567890.0,
+            last_event_time=1234567890.0
+        ))
+    
+    # 同价位的多个订单都能查到
+    orders = await order_manager.get_orders_by_price_range(Decimal("50000"), Decimal("50000"))
+    assert sorted(o.order_id for o in orders) == ["a", "b"]
+    
+    # 已完成的订单移出索引
+    await order_manager.update_order_status("a", OrderStatus.FILLED)
+    orders = await order_manager.get_orders_by_price_range(Decimal("0"), Decimal("100000"))
+    assert sorted(o.order_id for o in orders) == ["b", "c"]
+    
+    # 改单成功后按新价格索引
+    await order_manager.modify_order("c", new_price=Decimal("49000"))
+    await order_manager.apply_modification("c", True)
+    orders = await order_manager.get_orders_by_price_range(Decimal("48000"), Decimal("49500"))
+    assert [o.order_id for o in orders] == ["c"]
+    assert order_manager._price_levels == [49000 * PRICE_SCALE, 50000 * PRICE_SCALE]
+    
 async def test_order_properties(sample_order):
     """测试订单属性"""
     # 测试剩余数量
@@ -200,10 +229,42 @@ async def test_order_properties(sample_order):
     sample_order.status = OrderStatus.ACTIVE
     assert sample_order.is_active == True
     
+    # 价格的整数tick形式
+    assert sample_order.price_ticks == 50000 * PRICE_SCALE
+    
+    # 订单对象使用__slots__，不带__dict__
+    assert not hasattr(sample_order, '__dict__')
+    
     # 测试订单价值
     assert sample_order.order_value == Decimal("5000")  # 50000 * 0.1
     
-@pytest.mark.asyncio
+    # 整数tick和下单价格字符串通过set_price更新
+    assert sample_order.price_str == "50000"
+    sample_order.set_price(Decimal("50000.12345678"))
+    assert sample_order.price_ticks == 5000012345678
+    assert sample_order.price_str == "50000.12345678"
+    
+    # 模型层不校验价格精度，普通float价格也可直接写入
+    sample_order.set_price(0.1)
+    assert sample_order.price_ticks == 10000000
+    
+async def test_add_order_rejects_sub_tick_price(order_manager, sample_order):
+    """测试精度细于1 tick的订单在写入订单管理器时被拒绝"""
+    sample_order.price = Decimal("50000.123456789")
+    with pytest.raises(ValueError):
+        await order_manager.add_order(sample_order)
+    assert order_manager.orders == {}
+    assert order_manager._price_levels == []
+    
+async def test_modify_order_rejects_sub_tick_price(order_manager, sample_order):
+    """测试改单价格精度超过最小价格单位时拒绝改单"""
+    sample_order.status = OrderStatus.ACTIVE
+    await order_manager.add_order(sample_order)
+    
+    assert await order_manager.modify_order("test_order_123", new_price=Decimal("50000.000000001")) is False
+    assert sample_order.status == OrderStatus.ACTIVE
+    assert order_manager.pending_modifications == {}
+    
 async def test_archive_completed_order(order_manager, sample_order):
     """测试归档已完成订单"""
     await order_manager.add_order(sample_order)
@@ -214,16 +275,48 @@ async def test_archive_completed_order(order_manager, sample_order):
         OrderStatus.FILLED
     )
     
-    # 检查订单是否被归档
-    # 注意：归档是异步的，需要等待
-    await asyncio.sleep(0.1)
-    
-    # 订单应该还在（因为延迟清理）
+    # 归档在update_order_status内完成，订单应该还在（因为延迟清理）
     order = await order_manager.get_order_by_id("test_order_123")
     assert order is not None
     
-@pytest.mark.asyncio
 async def test_get_nonexistent_order(order_manager):
     """测试获取不存在的订单"""
     order = await order_manager.get_order_by_id("nonexistent")
-    assert order is None 
\ No newline at end of file
+    assert order is None 
+
+async def test_get_order_by_id_sync(order_manager, sample_order):
+    """测试同步获取订单"""
+    await order_manager.add_order(sample_order)
+    
+    order = order_manager.get_order_by_id_sync("test_order_123")
+    assert order is sample_order
+    assert order_manager.get_order_by_id_sync("nonexistent") is None
+
+async def test_submit_order_without_lock(recording_bus, sample_order):
+    """测试持锁期间提交订单立即写入且不挂起，状态事件非阻塞发布"""
+    manager = OrderManager(recording_bus)
+    async with manager._lock:
+        manager.submit_order(sample_order)
+        assert manager.get_order_by_id_sync("test_order_123") is sample_order
+        assert manager.client_order_mapping["client_123"] == "test_order_123"
+    
+    assert [e.order_id for e in recording_bus.published] == ["test_order_123"]
+    await manager.stop()
+
+async def test_submit_then_immediate_status_update(order_manager, sample_order):
+    """测试提交订单后立即更新状态（交易所订单ID返回前后）"""
+    sample_order.order_id = ""  # 待交易所返回
+    order_manager.submit_order(sample_order)
+    
+    # 交易所订单ID返回前以客户端订单ID查找
+    assert order_manager.get_order_by_id_sync("client_123") is sample_order
+    
+    # 登记交易所订单ID后立即更新状态
+    order_manager.bind_order_id("client_123", "exchange_1")
+    await order_manager.update_order_status("exchange_1", OrderStatus.ACTIVE)
+    
+    assert sample_order.order_id == "exchange_1"
+    assert sample_order.status == OrderStatus.ACTIVE
+    assert order_manager.get_order_by_id_sync("client_123") is None
+    assert order_manager.client_order_mapping["client_123"] == "exchange_1"
+    assert await order_manager.get_orders_by_price_range(Decimal("50000"), Decimal("50000")) == [sample_order]
@@ -3,94 +3,122 @@ import asyncio
 import time
 from src.utils.limiting.RateLimiter import RateLimiter
 
+# 模块内所有协程测试统一标记为asyncio测试
+pytestmark = pytest.mark.asyncio
+
+class FakeClock:
+    """可手动推进的单调时钟（整数纳秒）"""
+    
+    def __init__(self):
+        self.now_ns = 0
+    
+    def __call__(self) -> int:
+        return self.now_ns
+    
+    def advance(self, seconds: float) -> None:
+        self.now_ns += int(seconds * 1_000_000_000)
+
 class TestRateLimiter:
     """测试速率限制器"""
     
     @pytest.fixture
-    def rate_limiter(self):
+    def clock(self):
+        """创建可控时钟"""
+        return FakeClock()
+    
+    @pytest.fixture
+    def sleeps(self):
+        """记录注入的等待函数收到的等待时长"""
+        return []
+    
+    @pytest.fixture
+    def fake_sleep(self, sleeps):
+        """只记录等待时长而不真正等待的等待函数"""
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+        return fake_sleep
+    
+    @pytest.fixture
+    def rate_limiter(self, clock, fake_sleep):
         """创建速率限制器实例"""
-        return RateLimiter(max_requests_per_second=10)
-        
-    @pytest.mark.asyncio
+        return RateLimiter(max_requests_per_second=10, time_fn=clock, sleep_fn=fake_sleep)
+    
     async def test_init(self, rate_limiter):
         """测试初始化"""
         assert rate_limiter.max_requests == 10
-        assert len(rate_limiter.request_times) == 0
-        
-    @pytest.mark.asyncio
-    async def test_acquire_normal(self, rate_limiter):
+        assert rate_limiter._tokens == 10 * 1_000_000_000
+    
+    async def test_acquire_normal(self, rate_limiter, sleeps):
         """测试正常获取许可"""
-        start_time = time.time()
-        
         # 获取许可
         await rate_limiter.acquire()
         
-        end_time = time.time()
-        
         # 应该立即返回
-        assert end_time - start_time < 0.1
+        assert sleeps == []
         
-        # 检查请求时间记录
-        assert len(rate_limiter.request_times) == 1
-        
-    @pytest.mark.asyncio
-    async def test_acquire_rate_limit(self, rate_limiter):
+        # 检查令牌消耗
+        assert rate_limiter.get_current_rate() == 1
+    
+    async def test_acquire_rate_limit(self, rate_limiter, sleeps):
         """测试达到速率限制"""
         # 快速获取10个许可（达到限制）
         for i in range(10):
             await rate_limiter.acquire()
-            
-        # 第11个请求应该被延迟
-        start_time = time.time()
-        await rate_limiter.acquire()
-        end_time = time.time()
-        
-        # 应该等待约1秒
-        assert end_time - start_time >= 0.9
+        assert sleeps == []
         
-    @pytest.mark.asyncio
+        # 第11个请求应该被延迟一个令牌的补充时间（0.1秒）
+        await rate_limiter.acquire()
+        assert sleeps == [pytest.approx(0.1)]
+    
     async def test_acquire_multiple_requests(self, rate_limiter):
         """测试多个请求"""
         # 获取5个许可
         for i in range(5):
             await rate_limiter.acquire()
-            
+        
         # 检查当前速率
         current_rate = rate_limiter.get_current_rate()
         assert current_rate == 5
-        
-    @pytest.mark.asyncio
-    async def test_cleanup_old_requests(self, rate_limiter):
+    
+    async def test_cleanup_old_requests(self, rate_limiter, clock):
         """测试清理旧请求"""
         # 添加一些请求
         for i in range(5):
             await rate_limiter.acquire()
-            
-        # 等待超过1秒
-        await asyncio.sleep(1.1)
+        
+        # 时钟推进超过1秒
+        clock.advance(1.1)
         
         # 检查当前速率
         current_rate = rate_limiter.get_current_rate()
         assert current_rate == 0
+    
+    async def test_partial_refill(self, rate_limiter, clock):
+        """测试按经过时间部分补充令牌"""
+        for i in range(10):
+            await rate_limiter.acquire()
         
-    @pytest.mark.asyncio
-    async def test_concurrent_requests(self, rate_limiter):
+        # 0.3秒补充3个令牌
+        clock.advance(0.3)
+        assert rate_limiter.get_current_rate() == pytest.approx(7)
+    
+    async def test_concurrent_requests(self, rate_limiter, sleeps):
         """测试并发请求"""
         async def make_request():
             await rate_limiter.acquire()
             return time.time()
-            
+        
         # 并发发送10个请求
         tasks = [make_request() for _ in range(10)]
         results = await asyncio.gather(*tasks)
         
-        # 所有请求都应该成功
+        # 所有请求都应该成功且无需等待
         assert len(results) == 10
+        assert sleeps == []
         
-        # 检查请求时间记录
-        assert len(rate_limiter.request_times) == 10
-        
-    @pytest.mark.asyncio
+        # 令牌应该全部消耗
+        assert rate_limiter.get_current_rate() == 10
+    
     async def test_get_current_rate(self, rate_limiter):
         """测试获取当前速率"""
         # 初始速率应该为0
@@ -99,40 +127,65 @@ class TestRateLimiter:
         # 添加一些请求
         for i in range(3):
             await rate_limiter.acquire()
-            
+        
         # 当前速率应该为3
         assert rate_limiter.get_current_rate() == 3
-        
-    @pytest.mark.asyncio
-    async def test_rate_limit_different_values(self):
+    
+    async def test_rate_limit_different_values(self, clock, fake_sleep, sleeps):
         """测试不同的速率限制值"""
         # 测试低速率限制
-        low_rate_limiter = RateLimiter(max_requests_per_second=1)
+        low_rate_limiter = RateLimiter(max_requests_per_second=1, time_fn=clock, sleep_fn=fake_sleep)
         
-        start_time = time.time()
         await low_rate_limiter.acquire()
         await low_rate_limiter.acquire()
-        end_time = time.time()
         
         # 第二个请求应该等待约1秒
-        assert end_time - start_time >= 0.9
+        assert sleeps == [pytest.approx(1.0)]
         
         # 测试高速率限制
-        high_rate_limiter = RateLimiter(max_requests_per_second=100)
+        sleeps.clear()
+        high_rate_limiter = RateLimiter(max_requests_per_second=100, time_fn=clock, sleep_fn=fake_sleep)
         
-        start_time = time.time()
         for i in range(50):
             await high_rate_limiter.acquire()
-        end_time = time.time()
         
-        # 应该快速完成
-        assert end_time - start_time < 0.1
+        # 应该无需等待
+        assert sleeps == []
+    
+    async def test_sub_one_rate(self, clock, fake_sleep, sleeps):
+        """测试低于每秒1次的速率不会被截断为0"""
+        slow_rate_limiter = RateLimiter(max_requests_per_second=0.5, time_fn=clock, sleep_fn=fake_sleep)
+        assert slow_rate_limiter.enabled is True
+        
+        await slow_rate_limiter.acquire()
+        await slow_rate_limiter.acquire()
+        
+        # 每2秒补充1个令牌，第二个请求等待2秒
+        assert sleeps == [pytest.approx(2.0)]
+        assert slow_rate_limiter.get_current_rate() == pytest.approx(2)
+    
+    async def test_fractional_rate(self, clock, fake_sleep, sleeps):
+        """测试非整数速率按精确值补充令牌，不截断为整数"""
+        fractional_rate_limiter = RateLimiter(max_requests_per_second=2.5, time_fn=clock, sleep_fn=fake_sleep)
         
-    @pytest.mark.asyncio
+        # 容量为2.5个令牌：前2个请求立即通过，第3个等待补充剩余的0.5个令牌（0.2秒）
+        for i in range(3):
+            await fractional_rate_limiter.acquire()
+        assert sleeps == [pytest.approx(0.2)]
+        
+        # 之后每个请求间隔0.4秒（2.5次/秒），而不是截断为2次/秒的0.5秒
+        await fractional_rate_limiter.acquire()
+        assert sleeps == [pytest.approx(0.2), pytest.approx(0.6)]
+        
+        # 此时欠1.5个令牌，推进1秒补充2.5个令牌，剩余1个，最近消耗为1.5个
+        clock.advance(1.0)
+        assert fractional_rate_limiter.get_current_rate() == pytest.approx(1.5)
+    
     async def test_edge_cases(self, rate_limiter):
         """测试边界情况"""
         # 测试零速率限制（应该允许所有请求）
         zero_rate_limiter = RateLimiter(max_requests_per_second=0)
+        assert zero_rate_limiter.enabled is False
         
         start_time = time.time()
         await zero_rate_limiter.acquire()
@@ -150,26 +203,23 @@ class TestRateLimiter:
         
         # 应该立即返回
         assert end_time - start_time < 0.1
-        
-    @pytest.mark.asyncio
-    async def test_cleanup_mechanism(self, rate_limiter):
-        """测试清理机制"""
+    
+    async def test_refill_capped(self, rate_limiter, clock):
+        """测试令牌补充不超过桶容量"""
         # 添加一些请求
         for i in range(5):
             await rate_limiter.acquire()
-            
-        # 手动设置一些旧请求
-        old_time = time.time() - 2.0  # 2秒前
-        rate_limiter.request_times.appendleft(old_time)
         
-        # 获取当前速率（应该触发清理）
-        current_rate = rate_limiter.get_current_rate()
+        # 时钟推进2秒
+        clock.advance(2.0)
         
-        # 旧请求应该被清理
-        assert current_rate == 5
-        assert old_time not in rate_limiter.request_times
+        # 获取当前速率（应该触发补充）
+        current_rate = rate_limiter.get_current_rate()
         
-    @pytest.mark.asyncio
+        # 令牌补满但不超过容量
+        assert current_rate == 0
+        assert rate_limiter._tokens == 10 * 1_000_000_000
+    
     async def test_thread_safety(self, rate_limiter):
         """测试线程安全性"""
         # 模拟并发访问
@@ -177,11 +227,30 @@ class TestRateLimiter:
             await rate_limiter.acquire()
             await asyncio.sleep(0.01)  # 模拟处理时间
             return rate_limiter.get_current_rate()
-            
+        
         # 创建多个并发任务
         tasks = [concurrent_access() for _ in range(20)]
         results = await asyncio.gather(*tasks)
         
         # 所有任务都应该成功完成
         assert len(results) == 20
-        assert all(isinstance(r, int) for r in results) 
\ No newline at end of file
+        assert all(isinstance(r, float) for r in results)
+    
+    async def test_concurrent_requests_over_limit(self, rate_limiter, sleeps):
+        """测试并发请求超过限制时按速率排队"""
+        await asyncio.gather(*[rate_limiter.acquire() for _ in range(15)])
+        
+        # 超出的5个请求依次排队，等待时间分别为0.1~0.5秒
+        assert sleeps == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5])
+    
+    async def test_real_clock(self):
+        """测试默认使用真实单调时钟"""
+        real_rate_limiter = RateLimiter(max_requests_per_second=100)
+        
+        start_time = time.monotonic()
+        for i in range(101):
+            await real_rate_limiter.acquire()
+        end_time = time.monotonic()
+        
+        # 第101个请求约等待一个令牌的补充时间（0.01秒）
+        assert end_time - start_time >= 0.005
@@ -5,6 +5,7 @@ from src.strategy.engines.ReferencePriceEngine import ReferencePriceEngine
 import asyncio
 from src.core.events.EventBus import EventBus
 from src.core.events.EventType import PriceUpdateEvent, EventType
+from src.market.data.MarketDataGateway import MarketData, Trade, TRADE_WINDOW
 
 class TestReferencePriceEngine:
     """测试参考价格引擎"""
@@ -29,17 +30,14 @@ class TestReferencePriceEngine:
     @pytest.fixture
     def mock_market_data(self):
         """创建模拟市场数据"""
-        market_data = Mock()
+        market_data = MarketData()
         market_data.mid_price = Decimal("50000")
-        market_data.recent_trades = []
         
-        # 添加模拟交易数据
+        # 添加交易数据（同时写入交易数组）
         for i in range(10):
-            trade = Mock()
-            trade.price = Decimal("50000") + Decimal(str(i * 10))
-            trade.volume = Decimal("0.1")
-            trade.timestamp = 1234567890 + i
-            market_data.recent_trades.append(trade)
+            price = Decimal("50000") + Decimal(str(i * 10))
+            trade = Trade(price, Decimal("0.1"), 1234567890.0 + i)
+            market_data.add_trade(trade, float(price), 0.1)
             
         return market_data
         
@@ -123,17 +121,14 @@ class TestReferencePriceEngine:
         
     def test_calculate_twap_with_timestamps(self, price_engine):
         """测试带时间戳的TWAP计算"""
-        market_data = Mock()
+        market_data = MarketData()
         market_data.mid_price = Decimal("50000")
-        market_data.recent_trades = []
         
         # 添加带时间戳的交易
         for i in range(5):
-            trade = Mock()
-            trade.price = Decimal("50000") + Decimal(str(i * 10))
-            trade.volume = Decimal("0.1")
-            trade.timestamp = 1234567890 + i
-            market_data.recent_trades.append(trade)
+            price = Decimal("50000") + Decimal(str(i * 10))
+            trade = Trade(price, Decimal("0.1"), 1234567890.0 + i)
+            market_data.add_trade(trade, float(price), 0.1)
             
         result = price_engine._calculate_twap(market_data)
         
@@ -196,6 +191,40 @@ class TestReferencePriceEngine:
         assert trade.price > 0
         assert trade.volume > 0
         assert trade.timestamp > 0
+        
+    def test_vectorized_reference_prices(self, price_engine):
+        """测试基于交易数组的VWAP/TWAP计算"""
+        market_data = MarketData()
+        market_data.mid_price = Decimal("50000")
+        
+        # 写入超过窗口大小的交易，验证环形缓冲区只保留最近的交易
+        for i in range(TRADE_WINDOW + 5):
+            price = 50000.0 + i
+            volume = 0.1 * (i % 3 + 1)
+            trade = Trade(Decimal(str(price)), Decimal(str(volume)), 1234567890.0 + i)
+            market_data.add_trade(trade, price, volume)
+            
+        assert market_data.trade_count == TRADE_WINDOW
+        trades = list(market_data.recent_trades)
+        
+        expected_vwap = sum(float(t.price) * float(t.volume) for t in trades) / sum(float(t.volume) for t in trades)
+        expected_twap = sum(float(t.price) * t.timestamp for t in trades) / sum(t.timestamp for t in trades)
+        
+        vwap = price_engine._calculate_vwap(market_data)
+        twap = price_engine._calculate_twap(market_data)
+        
+        assert isinstance(vwap, Decimal)
+        assert isinstance(twap, Decimal)
+        assert abs(vwap - Decimal(str(expected_vwap))) < Decimal("0.0001")
+        assert abs(twap - Decimal(str(expected_twap))) < Decimal("0.0001")
+        
+    def test_vectorized_reference_prices_no_trades(self, price_engine):
+        """测试交易数组为空时返回中间价"""
+        market_data = MarketData()
+        market_data.mid_price = Decimal("50000")
+        
+        assert price_engine._calculate_vwap(market_data) == Decimal("50000")
+        assert price_engine._calculate_twap(market_data) == Decimal("50000")
 
 @pytest.mark.asyncio
 async def test_twap_calculation():
@@ -211,6 +240,15 @@ async def test_twap_calculation():
     assert twap == Decimal('102')
     await event_bus.stop()
 
+@pytest.mark.asyncio
+async def test_twap_calculation_window_rolls():
+    config = type('Config', (), {'twap_window': 3, 'confidence_threshold': 0.95, 'max_price_deviation': 0.05})()
+    engine = ReferencePriceEngine(config)
+    # 窗口满后最早的价格被挤出
+    for price in ('100', '102', '104', '110'):
+        await engine.on_market_price(Decimal(price))
+    assert engine._calculate_twap() == (Decimal('102') + Decimal('104') + Decimal('110')) / 3
+
 @pytest.mark.asyncio
 async def test_price_update_event():
     event_bus = EventBus()
@@ -218,11 +256,13 @@ async def test_price_update_event():
     config = type('Config', (), {'twap_window': 2, 'confidence_threshold': 0.95, 'max_price_deviation': 0.05})()
     engine = ReferencePriceEngine(config, event_bus)
     received = []
+    done = asyncio.Event()
     async def handler(event):
         received.append(event)
+        done.set()
     await event_bus.subscribe(EventType.PRICE_UPDATE, handler)
     await engine.on_market_price(Decimal('100'))
     await engine.on_market_price(Decimal('102'))
-    await asyncio.sleep(0.1)
+    await asyncio.wait_for(done.wait(), timeout=1.0)
     assert any(isinstance(e, PriceUpdateEvent) for e in received)
     await event_bus.stop() 
\ No newline at end of file
@@ -1,38 +1,67 @@
 import pytest
 import pytest_asyncio
 import asyncio
+import dataclasses
 from src.strategy.engines.StrategyEngine import StrategyEngine
-from src.core.orders.OrderState import OrderManager, OrderState, OrderStatus
+from src.core.orders.OrderManager import OrderManager
+from src.core.orders.OrderState import OrderState, OrderStatus
 from src.core.orders.OrderAnalysis import OrderAnalysis
-from src.core.orders.OrderDecision import PlaceOrderDecision, CancelOrderDecision
-from src.core.events.EventBus import EventBus
+from src.core.orders.OrderDecision import PlaceOrderDecision, CancelOrderDecision, ModifyOrderDecision
 from decimal import Decimal
-import time
 from src.config.Configs import StrategyConfig
 from unittest.mock import Mock, AsyncMock
 
-@pytest_asyncio.fixture
-async def event_bus():
-    bus = EventBus()
-    await bus.start()
-    yield bus
-    await bus.stop()
+# 模块内所有协程测试共用会话级事件循环（与共享事件总线一致）
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# 固定的测试时间戳（测试不依赖真实时钟）
+T0 = 1_700_000_000.0
+
+# 测试中反复使用的Decimal常量，模块加载时只解析一次
+D0 = Decimal("0")
+D0_2 = Decimal("0.2")
+D100 = Decimal("100")
+D50000 = Decimal("50000")
+D50500 = Decimal("50500")
+D51000 = Decimal("51000")
+
+STRATEGY_CONFIG_PARAMS = dict(
+    symbol="BTCUSDT",
+    min_spread=Decimal("0.002"),  # 0.2%
+    max_spread=Decimal("0.004"),  # 0.4%
+    min_order_value=Decimal("10000"),
+    target_orders_per_side=1,
+    drift_threshold=Decimal("0.005"),  # 0.5%
+    rebalance_interval=5,
+    modify_threshold=Decimal("0.003"),  # 0.3%
+    max_modify_deviation=Decimal("0.01")  # 1%
+)
+
+# 示例订单模板，测试中按需替换订单ID、方向和价格
+_ORDER_TEMPLATE = OrderState(
+    order_id="",
+    client_order_id="",
+    symbol="BTCUSDT",
+    side="BUY",
+    price=D50000,
+    original_quantity=D0_2,
+    executed_quantity=D0,
+    status=OrderStatus.ACTIVE,
+    create_time=1234567890.0,
+    update_time=1234567890.0,
+    last_event_time=1234567890.0
+)
 
 @pytest_asyncio.fixture
 def strategy_config():
-    class Config:
-        min_spread = 0.002
-        max_spread = 0.004
-        min_order_value = 10000
-        drift_threshold = 0.005
-        target_orders_per_side = 1
-    return Config()
+    return StrategyConfig(**STRATEGY_CONFIG_PARAMS)
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(loop_scope="session")
 async def order_manager(event_bus):
-    return OrderManager(event_bus)
+    manager = OrderManager(event_bus)
+    yield manager
+    await manager.stop()
 
-@pytest.mark.asyncio
 async def test_analyze_current_orders(order_manager, strategy_config, event_bus):
     engine = StrategyEngine(strategy_config, event_bus, order_manager)
     # 添加活跃订单
@@ -41,25 +70,24 @@ async def test_analyze_current_orders(order_manager, strategy_config, event_bus)
         client_order_id="c1",
         symbol="BTCUSDT",
         side="BUY",
-        price=Decimal('100'),
+        price=D100,
         original_quantity=Decimal('1'),
-        executed_quantity=Decimal('0'),
+        executed_quantity=D0,
         status=OrderStatus.ACTIVE,
-        create_time=time.time(),
-        update_time=time.time(),
-        last_event_time=time.time()
+        create_time=T0,
+        update_time=T0,
+        last_event_time=T0
     )
     await order_manager.add_order(order)
-    analysis = await engine._analyze_current_orders(Decimal('100'))
+    analysis = await engine._analyze_current_orders(D100)
     assert isinstance(analysis, OrderAnalysis)
 
-@pytest.mark.asyncio
 async def test_generate_order_decisions(order_manager, strategy_config, event_bus):
     engine = StrategyEngine(strategy_config, event_bus, order_manager)
     analysis = OrderAnalysis()
     analysis.need_bid_orders = 1
     analysis.need_ask_orders = 1
-    decisions = await engine._generate_order_decisions(analysis, Decimal('100'))
+    decisions = await engine._generate_order_decisions(analysis, D100)
     assert any(isinstance(d, PlaceOrderDecision) for d in decisions)
     assert all(isinstance(d, (PlaceOrderDecision, CancelOrderDecision)) for d in decisions)
 
@@ -69,61 +97,28 @@ class TestStrategyEngine:
     @pytest.fixture
     def strategy_config(self):
         """创建策略配置"""
-        return StrategyConfig(
-            symbol="BTCUSDT",
-            min_spread=Decimal("0.002"),  # 0.2%
-            max_spread=Decimal("0.004"),  # 0.4%
-            min_order_value=Decimal("10000"),
-            target_orders_per_side=1,
-            drift_threshold=Decimal("0.005"),  # 0.5%
-            rebalance_interval=5
-        )
+        return StrategyConfig(**STRATEGY_CONFIG_PARAMS)
         
     @pytest_asyncio.fixture
-    async def strategy_engine(self, strategy_config):
+    async def strategy_engine(self, strategy_config, recording_bus):
         """创建策略引擎实例"""
-        event_bus = Mock(spec=EventBus)
-        event_bus.publish = AsyncMock()
         order_manager = Mock(spec=OrderManager)
         order_manager.get_active_orders = AsyncMock()
-        return StrategyEngine(strategy_config, event_bus, order_manager)
+        return StrategyEngine(strategy_config, recording_bus, order_manager)
         
     @pytest.fixture
     def sample_orders(self):
         """创建示例订单"""
         return [
-            OrderState(
-                order_id="order1",
-                client_order_id="client1",
-                symbol="BTCUSDT",
-                side="BUY",
-                price=Decimal("50000"),
-                original_quantity=Decimal("0.2"),
-                executed_quantity=Decimal("0"),
-                status=OrderStatus.ACTIVE,
-                create_time=1234567890.0,
-                update_time=1234567890.0,
-                last_event_time=1234567890.0
-            ),
-            OrderState(
-                order_id="order2",
-                client_order_id="client2",
-                symbol="BTCUSDT",
-                side="SELL",
-                price=Decimal("51000"),
-                original_quantity=Decimal("0.2"),
-                executed_quantity=Decimal("0"),
-                status=OrderStatus.ACTIVE,
-                create_time=1234567890.0,
-                update_time=1234567890.0,
-                last_event_time=1234567890.0
-            )
+            dataclasses.replace(_ORDER_TEMPLATE, order_id="order1", client_order_id="client1",
+                                side="BUY", price=D50000),
+            dataclasses.replace(_ORDER_TEMPLATE, order_id="order2", client_order_id="client2",
+                                side="SELL", price=D51000)
         ]
         
-    @pytest.mark.asyncio
     async def test_analyze_current_orders_normal(self, strategy_engine, sample_orders):
         """测试正常情况下的订单分析"""
-        reference_price = Decimal("50500")
+        reference_price = D50500
         # Set order prices within allowed spread
         sample_orders[0].price = Decimal("50400")
         sample_orders[1].price = Decimal("50600")
@@ -134,7 +129,6 @@ class TestStrategyEngine:
         assert analysis.need_bid_orders == 0
         assert analysis.need_ask_orders == 0
         
-    @pytest.mark.asyncio
     async def test_analyze_current_orders_drift_exceeded(self, strategy_engine, sample_orders):
         """测试价格偏离过大的情况"""
         # 设置参考价格，使订单偏离过大
@@ -149,10 +143,9 @@ class TestStrategyEngine:
         assert "order1" in analysis.orders_to_cancel
         assert "order2" in analysis.orders_to_cancel
         
-    @pytest.mark.asyncio
     async def test_analyze_current_orders_too_close(self, strategy_engine, sample_orders):
         """测试订单过于接近参考价格的情况"""
-        reference_price = Decimal("50500")
+        reference_price = D50500
         # Set both orders to be very close to reference_price
         sample_orders[0].price = Decimal("50501")
         sample_orders[1].price = Decimal("50499")
@@ -160,20 +153,33 @@ class TestStrategyEngine:
         analysis = await strategy_engine._analyze_current_orders(reference_price)
         assert len(analysis.orders_to_cancel) == 2
         
-    @pytest.mark.asyncio
+    async def test_analyze_current_orders_modify(self, strategy_engine, sample_orders):
+        """测试偏差在改单范围内时改单而非撤单"""
+        assert strategy_engine.modify_threshold == Decimal("0.003")
+        assert strategy_engine.max_modify_deviation == Decimal("0.01")
+        reference_price = D50500
+        # 偏差约0.7%，超过漂移阈值但在最大改单偏差内
+        sample_orders[0].price = Decimal("50150")
+        sample_orders[1].price = Decimal("50850")
+        strategy_engine.order_manager.get_active_orders.return_value = sample_orders
+        analysis = await strategy_engine._analyze_current_orders(reference_price)
+        assert len(analysis.orders_to_cancel) == 0
+        assert [m['order_id'] for m in analysis.orders_to_modify] == ["order1", "order2"]
+        decisions = await strategy_engine._generate_order_decisions(analysis, reference_price)
+        assert all(isinstance(d, ModifyOrderDecision) for d in decisions)
+        
     async def test_analyze_current_orders_missing_orders(self, strategy_engine):
         """测试缺少订单的情况"""
         # 没有活跃订单
         strategy_engine.order_manager.get_active_orders.return_value = []
         
-        reference_price = Decimal("50500")
+        reference_price = D50500
         analysis = await strategy_engine._analyze_current_orders(reference_price)
         
         # 需要添加买卖订单
         assert analysis.need_bid_orders == 1
         assert analysis.need_ask_orders == 1
         
-    @pytest.mark.asyncio
     async def test_generate_order_decisions(self, strategy_engine):
         """测试生成订单决策"""
         # 创建分析结果
@@ -182,7 +188,7 @@ class TestStrategyEngine:
         analysis.need_bid_orders = 1
         analysis.need_ask_orders = 1
         
-        reference_price = Decimal("50500")
+        reference_price = D50500
         
         decisions = await strategy_engine._generate_order_decisions(analysis, reference_price)
         
@@ -205,21 +211,19 @@ class TestStrategyEngine:
         ask_decision = next(d for d in place_decisions if d.side == "SELL")
         assert ask_decision.price > reference_price
         
-    @pytest.mark.asyncio
     async def test_calculate_order_quantity(self, strategy_engine):
         """测试订单数量计算"""
-        price = Decimal("50000")
+        price = D50000
         quantity = strategy_engine._calculate_order_quantity(price)
         
         # 检查最小价值要求
         order_value = price * quantity
         assert order_value >= strategy_engine.min_order_value
         
-        # 检查随机性
-        quantity2 = strategy_engine._calculate_order_quantity(price)
-        assert quantity != quantity2  # 应该有随机性
+        # 检查随机性（低于最小价值的数量会被截到同一值，因此多次采样）
+        quantities = {strategy_engine._calculate_order_quantity(price) for _ in range(20)}
+        assert len(quantities) > 1  # 应该有随机性
         
-    @pytest.mark.asyncio
     async def test_on_price_update(self, strategy_engine):
         """测试价格更新处理"""
         # 模拟价格事件
@@ -228,7 +232,7 @@ class TestStrategyEngine:
             event_type=None,
             timestamp=1234567890.0,
             data={},
-            reference_price=Decimal("50500"),
+            reference_price=D50500,
             price_change=Decimal("0.001"),
             confidence=0.95
         )
@@ -246,13 +250,12 @@ class TestStrategyEngine:
         await strategy_engine.on_price_update(price_event)
         
         # 检查是否调用了分析方法
-        strategy_engine._analyze_current_orders.assert_called_once_with(Decimal("50500"))
+        strategy_engine._analyze_current_orders.assert_called_once_with(D50500)
         strategy_engine._generate_order_decisions.assert_called_once()
         
-    @pytest.mark.asyncio
     async def test_optimal_order_prices(self, strategy_engine):
         """测试最优订单位置计算"""
-        reference_price = Decimal("50000")
+        reference_price = D50000
         
         # 计算最优价格
         optimal_bid_price = reference_price * (Decimal('1') - strategy_engine.max_spread * Decimal('0.5'))
@@ -265,4 +268,16 @@ class TestStrategyEngine:
         # 检查价差
         spread = (optimal_ask_price - optimal_bid_price) / reference_price
         assert spread <= strategy_engine.max_spread
-        assert spread >= strategy_engine.min_spread * Decimal('0.5') 
\ No newline at end of file
+        assert spread >= strategy_engine.min_spread * Decimal('0.5')
+        
+    async def test_optimal_price_tick_aligned(self, strategy_engine):
+        """测试报价对齐到最小价格单位，且买价向下、卖价向上取整"""
+        reference_price = Decimal("50500.123456789123")
+        
+        bid_price = strategy_engine._calculate_optimal_price('BUY', reference_price)
+        ask_price = strategy_engine._calculate_optimal_price('SELL', reference_price)
+        
+        assert bid_price == bid_price.quantize(Decimal("0.00000001"))
+        assert ask_price == ask_price.quantize(Decimal("0.00000001"))
+        assert bid_price <= reference_price * strategy_engine._bid_factor
+        assert ask_price >= reference_price * strategy_engine._ask_factor